@@ -1,12 +1,20 @@
 # app/main.py
+import os
+
 import dash
 from dash import dcc, html
-from flask_login import LoginManager, current_user
+from flask import abort, jsonify, send_file
+from flask_login import LoginManager, current_user, login_required
 from components.header import create_navbar, create_sidebar
 from components.layout_utils import create_overlay, create_footer
 from styles.styles import content_style
 from callbacks import eco_callbacks, shared_callbacks, stock_callbacks
-from models.user import UserManager
+from models.user import UserManager, user_cache
+from config.settings import Config
+from services.lazy_data import warm_up
+from services.scheduler import refresh_scheduler
+from services.report_cache import report_cache
+from services.report_jobs import report_jobs
 import pages
 
 app = dash.Dash(__name__, suppress_callback_exceptions=True, title='Observatoire Économique Intelligent')
@@ -24,12 +32,73 @@ user_manager = UserManager()
 
 @login_manager.user_loader
 def load_user(user_id):
-    return user_manager.get_user_by_id(int(user_id))
+    return user_manager.get_cached_user(int(user_id))
+
+
+@server.route('/stats/refresh')
+@login_required
+def refresh_stats():
+    """Last refresh time and duration of every data source"""
+    return jsonify(refresh_scheduler.stats())
+
+
+@server.route('/reports/<key>.pdf')
+@login_required
+def download_report(key):
+    """Serve a generated PDF report from the report cache"""
+    path = report_cache.file(key)
+    if path is None:
+        abort(404)
+    return send_file(os.path.abspath(path), mimetype='application/pdf', download_name='rapport_articles.pdf')
+
+
+@server.route('/stats/reports')
+@login_required
+def report_stats():
+    """Hit ratio and size of the report cache, and report jobs per status"""
+    return jsonify({'cache': report_cache.stats(), 'jobs': report_jobs.stats()})
+
+
+@server.route('/stats/user-cache')
+@login_required
+def user_cache_stats():
+    """Hit/miss counters of the user cache, to check it in production"""
+    return jsonify(user_cache.stats())
 
 
 # Register pages
 pages.register_pages(app)
 
+
+def schedule_data_refresh(config):
+    """Refresh the loaded data sources in the background, publishing new snapshots"""
+    from pages import bourse, eco, zoom
+    from services.news_store import news_store
+    from services.stock_service import stock_service
+
+    paths = config.config.get('paths', {})
+    refresh_scheduler.add('news', news_store.refresh, config.get_refresh_interval('news', 60),
+                          loaded=lambda: news_store.loaded)
+    refresh_scheduler.add('stock', stock_service.reload_data, config.get_refresh_interval('stock'),
+                          paths=stock_service.get_data_paths(), loaded=lambda: stock_service.loaded)
+    refresh_scheduler.add('bourse', bourse.reload_data, config.get_refresh_interval('bourse'),
+                          paths=[bourse.HISTORICAL_DATA_PATH, bourse.INDICES_DATA_PATH],
+                          loaded=lambda: bourse.market_data.loaded)
+    refresh_scheduler.add('eco', eco.eco_figures.reload, config.get_refresh_interval('eco'),
+                          paths=[paths.get('credit_data'), paths.get('inflation')],
+                          loaded=lambda: eco.eco_figures.loaded)
+    refresh_scheduler.add('zoom', zoom.ipc_data.reload, config.get_refresh_interval('zoom'),
+                          paths=[paths.get('ipc')], loaded=lambda: zoom.ipc_data.loaded)
+    refresh_scheduler.start()
+
+
+# Page data is loaded on first visit, or at startup if configured, then kept fresh in the background
+app_config = Config()
+if app_config.get_warm_up_pages():
+    warm_up()
+if app_config.get_refresh_enabled():
+    schedule_data_refresh(app_config)
+
 app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
     dcc.Store(id='sidebar-state', data={'open': False}),
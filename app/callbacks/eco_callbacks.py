@@ -1,52 +1,29 @@
 # callbacks/eco_callbacks.py
 
 import pandas as pd
-from dash import ALL, Input, Output, State, callback, callback_context
+from dash import MATCH, Input, Output, Patch, State, callback, callback_context, no_update
 from services.favorites_service import FavoritesService
 from components.news_components import create_news_items_with_favorites
-from services.eco_service import EcoService
-from datetime import timedelta
+from services.eco_service import EcoService, NEWS_PAGE_SIZE
 
 favorites_service = FavoritesService()
 eco_service = EcoService()
-news_df = eco_service.load_news_data()
 
 @callback(
-    Output({'type': 'favorite-btn', 'index': ALL}, 'children'),
-    Input({'type': 'favorite-btn', 'index': ALL}, 'n_clicks'),
-    State({'type': 'article-data', 'index': ALL}, 'children'),
+    Output({'type': 'favorite-btn', 'index': MATCH}, 'children'),
+    Input({'type': 'favorite-btn', 'index': MATCH}, 'n_clicks'),
     prevent_initial_call=True
 )
-def handle_favorite_click(n_clicks, article_data_list):
-    if not callback_context.triggered:
-        return ['🤍'] * len(n_clicks)
+def handle_favorite_click(n_clicks):
+    # Only the clicked button is updated; it carries the article id, resolved on the server
+    if not n_clicks:
+        return no_update
 
-    button_id = callback_context.triggered[0]['prop_id'].split('.')[0]
-    clicked_unique_id = eval(button_id)['index']
+    article = eco_service.get_article(callback_context.triggered_id['index'])
+    if article is None:
+        return no_update
 
-    clicked_article_data = None
-    for data_str in article_data_list:
-        data = eval(data_str)
-        if f"{data['title']}_{data['published'].replace('-', '').replace(':', '').replace(' ', '_')}" == clicked_unique_id:
-            clicked_article_data = data
-            break
-
-    if clicked_article_data is None:
-        return ['🤍'] * len(n_clicks)
-
-    favorited = favorites_service.is_favorited(clicked_article_data['title'], clicked_article_data['published'])
-
-    if favorited:
-        favorites_service.remove_from_favorites(clicked_article_data['title'], clicked_article_data['published'])
-    else:
-        favorites_service.save_to_favorites(clicked_article_data)
-
-    result = []
-    for data_str in article_data_list:
-        data = eval(data_str)
-        result.append('❤️' if favorites_service.is_favorited(data['title'], data['published']) else '🤍')
-
-    return result
+    return '❤️' if favorites_service.toggle_favorite(article) else '🤍'
 
 @callback(
     Output('custom-date-container', 'style'),
@@ -62,7 +39,10 @@ def toggle_custom_date_inputs(period_value):
     [
         Output('news-container', 'children'),
         Output('sentiment-chart', 'figure'),
-        Output('theme-chart', 'figure')
+        Output('theme-chart', 'figure'),
+        Output('news-page-store', 'data'),
+        Output('load-more-news-btn', 'style'),
+        Output('load-more-news-btn', 'children')
     ],
     [
         Input('sentiment-filter-dropdown', 'value'),
@@ -70,41 +50,39 @@ def toggle_custom_date_inputs(period_value):
         Input('search-input', 'value'),
         Input('date-period-dropdown', 'value'),
         Input('start-date-picker', 'date'),
-        Input('end-date-picker', 'date')
-    ]
+        Input('end-date-picker', 'date'),
+        Input('sort-order-dropdown', 'value'),
+        Input('load-more-news-btn', 'n_clicks')
+    ],
+    State('news-page-store', 'data')
 )
-def update_news_display(sentiment_filter, theme_filter, search_query, date_period, start_date, end_date):
-    global news_df
-    if news_df.empty:
-        return [], eco_service.create_sentiment_chart(news_df), eco_service.create_theme_chart(news_df)
-
-    filtered_df = news_df.copy()
-
-    if date_period and date_period != 'all':
-        start_range, end_range = eco_service.calculate_date_range(date_period, start_date, end_date)
-        if start_range and end_range:
-            start_datetime = pd.to_datetime(start_range)
-            end_datetime = pd.to_datetime(end_range) + timedelta(hours=23, minutes=59, seconds=59)
-            filtered_df = filtered_df[(filtered_df['published'] >= start_datetime) & (filtered_df['published'] <= end_datetime)]
-
-    if sentiment_filter and sentiment_filter != 'Tous':
-        filtered_df = filtered_df[filtered_df['sentiment'] == sentiment_filter]
-
-    if theme_filter and theme_filter != 'Tous':
-        filtered_df = filtered_df[filtered_df['theme'] == theme_filter]
-
-    if search_query and search_query.strip():
-        search_term = search_query.strip().lower()
-        mask = (
-            filtered_df['title'].str.lower().str.contains(search_term, na=False) |
-            filtered_df['mini_resume'].str.lower().str.contains(search_term, na=False)
-        )
-        filtered_df = filtered_df[mask]
-
-    filtered_df = filtered_df.sort_values('published', ascending=False)
-
-    sentiment_fig = eco_service.create_sentiment_chart(filtered_df)
-    theme_fig = eco_service.create_theme_chart(filtered_df)
-    news_items = create_news_items_with_favorites(filtered_df)
-
-    return news_items, sentiment_fig, theme_fig
+def update_news_display(sentiment_filter, theme_filter, search_query, date_period, start_date, end_date, sort_by,
+                        load_more_clicks, page_state):
+    """Render the first page of matching articles, or append the next one on "Charger plus"."""
+    triggered = callback_context.triggered[0]['prop_id'] if callback_context.triggered else ''
+
+    snapshot, ids = eco_service.filter_news_ids(sentiment_filter, theme_filter, date_period, start_date, end_date,
+                                                search_query=search_query, sort_by=sort_by)
+    # Resume after the last article shown; a reloaded snapshot restarts the feed from the top
+    start = eco_service.next_page_start(snapshot, ids, page_state) \
+        if triggered.startswith('load-more-news-btn') else None
+    offset = start or 0
+    page_ids = ids[offset:offset + NEWS_PAGE_SIZE]
+    shown = offset + len(page_ids)
+    button_style, button_label = eco_service.get_load_more_button(shown, len(ids))
+    if start is not None and not len(page_ids):
+        return no_update, no_update, no_update, no_update, button_style, button_label
+    page_state = eco_service.news_page_state(snapshot, ids, page_ids)
+
+    if start is not None:
+        # Only the new page travels to the browser; the rendered cards are kept
+        news_items = Patch()
+        news_items.extend(create_news_items_with_favorites(snapshot.rows(page_ids)))
+        return news_items, no_update, no_update, page_state, button_style, button_label
+
+    # Charts describe every matching article, counted on the index rather than the rendered cards
+    sentiment_fig = eco_service.create_sentiment_chart(sentiment_counts=snapshot.counts('sentiment', ids))
+    theme_fig = eco_service.create_theme_chart(theme_counts=snapshot.counts('theme', ids))
+    news_items = create_news_items_with_favorites(snapshot.rows(page_ids))
+
+    return news_items, sentiment_fig, theme_fig, page_state, button_style, button_label
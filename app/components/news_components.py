@@ -1,14 +1,78 @@
 # components/news_components.py
 
+import threading
+from collections import OrderedDict
+
 import pandas as pd
 from dash import html
 from services.stock_service import stock_service
 from config.settings import Config
 from services.favorites_service import FavoritesService
+from services.article_ids import PUBLISHED_FORMAT, article_ids
 
 config = Config()
 favorites_service = FavoritesService()
 
+# Maximum number of rendered cards kept per list
+CARD_CACHE_SIZE = 2000
+
+
+class CardCache:
+    """LRU cache of rendered article cards keyed by (article id, favorite state).
+
+    Each entry also keeps the row it was rendered from, so a card is rebuilt
+    when the article itself changed in the source data.
+    """
+
+    def __init__(self, max_size=CARD_CACHE_SIZE):
+        self.max_size = max_size
+        self._cards = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, row, build):
+        """Return the cached card for key, rendering it with build() if needed."""
+        with self._lock:
+            entry = self._cards.get(key)
+            if entry is not None and entry[0] == row:
+                self._cards.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        card = build()
+        with self._lock:
+            self.misses += 1
+            self._cards[key] = (row, card)
+            self._cards.move_to_end(key)
+            while len(self._cards) > self.max_size:
+                self._cards.popitem(last=False)
+        return card
+
+    def clear(self):
+        with self._lock:
+            self._cards.clear()
+
+
+news_card_cache = CardCache()
+stock_news_card_cache = CardCache()
+
+
+def _card_records(df):
+    """Rows as dicts, with the date strings the cards need formatted column-wide."""
+    published = df['published']
+    # Missing values become None so an unchanged row compares equal to its cached copy
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    formatted = {
+        'article_id': pd.Series(article_ids(df['title'], published)),
+        'published_str': published.dt.strftime(PUBLISHED_FORMAT),
+        'published_day': published.dt.strftime('%d/%m/%Y'),
+        'published_minute': published.dt.strftime('%d/%m/%Y %H:%M')
+    }
+    for name, values in formatted.items():
+        for record, value in zip(records, values.tolist()):
+            record[name] = value
+    return records
+
 
 def create_news_items_with_favorites(df):
     """Create economic news items with favorite functionality (for home page)"""
@@ -26,118 +90,110 @@ def create_news_items_with_favorites(df):
         ]
 
     items = []
+    rows = _card_records(df)
+    favorite_flags = favorites_service.are_favorited((row['title'], row['published_str']) for row in rows)
+
+    for row, favorited in zip(rows, favorite_flags):
+        unique_id = row['article_id']
+        items.append(news_card_cache.get(
+            (unique_id, favorited), row,
+            lambda: _build_news_card(row, unique_id, favorited)
+        ))
+    return items
 
-    for i, (idx, row) in enumerate(df.iterrows()):
-        sentiment_color = {
-            'Positif': config.COLORS['success'],
-            'Négatif': config.COLORS['danger'],
-            'Neutre': config.COLORS['neutral']
-        }.get(row['sentiment'], config.COLORS['neutral'])
 
-        favorited = favorites_service.is_favorited(row['title'], row['published'].strftime('%Y-%m-%d %H:%M:%S'))
-        unique_id = f"{row['title']}_{row['published'].strftime('%Y%m%d_%H%M%S')}"
+def _build_news_card(row, unique_id, favorited):
+    """Render one economic news card"""
+    sentiment_color = {
+        'Positif': config.COLORS['success'],
+        'Négatif': config.COLORS['danger'],
+        'Neutre': config.COLORS['neutral']
+    }.get(row['sentiment'], config.COLORS['neutral'])
 
-        items.append(
+    return html.Div([
+        html.Div([
             html.Div([
-                html.Div([
-                    html.Div([
-                        html.Span(row.get('theme', 'Économie'), style={
-                            'background': config.COLORS['primary'],
-                            'color': 'white',
-                            'padding': '8px 16px',
-                            'border-radius': '20px',
-                            'font-size': '12px',
-                            'font-weight': '600',
-                            'display': 'inline-block'
-                        }),
-                        html.Span(row['sentiment'], style={
-                            'background': sentiment_color,
-                            'color': 'white',
-                            'padding': '8px 16px',
-                            'border-radius': '20px',
-                            'font-size': '12px',
-                            'margin-left': '12px',
-                            'font-weight': '500',
-                            'display': 'inline-block'
-                        })
-                    ], style={'display': 'inline-block'}),
-                    html.Button(
-                        '❤️' if favorited else '🤍',
-                        id={'type': 'favorite-btn', 'index': unique_id},
-                        style={
-                            'background': 'none',
-                            'border': 'none',
-                            'fontSize': '20px',
-                            'cursor': 'pointer',
-                            'float': 'right',
-                            'padding': '5px 10px',
-                            'borderRadius': '50%',
-                            'transition': 'transform 0.2s ease'
-                        },
-                        title='Ajouter aux favoris' if not favorited else 'Retirer des favoris'
-                    )
-                ], style={'margin-bottom': '15px', 'display': 'flex', 'justify-content': 'space-between', 'align-items': 'center'}),
-                html.Div(
-                    id={'type': 'article-data', 'index': unique_id},
-                    children=str({
-                        'source': row.get('source', ''),
-                        'theme': row.get('theme', 'Économie'),
-                        'title': row['title'],
-                        'summary': row.get('summary', ''),
-                        'mini_resume': row.get('mini_resume', ''),
-                        'sentiment': row['sentiment'],
-                        'published': row['published'].strftime('%Y-%m-%d %H:%M:%S'),
-                        'link': row.get('link', '')
-                    }),
-                    style={'display': 'none'}
-                ),
-                html.H4(row['title'], style={
-                    'margin': '0 0 12px 0',
-                    'font-size': '18px',
-                    'color': config.COLORS['primary'],
-                    'line-height': '1.4',
-                    'font-weight': '600'
-                }),
-                html.P(row['mini_resume'], style={
-                    'margin': '0 0 12px 0',
-                    'font-size': '14px',
-                    'color': config.COLORS['text'],
-                    'line-height': '1.6'
+                html.Span(row.get('theme', 'Économie'), style={
+                    'background': config.COLORS['primary'],
+                    'color': 'white',
+                    'padding': '8px 16px',
+                    'border-radius': '20px',
+                    'font-size': '12px',
+                    'font-weight': '600',
+                    'display': 'inline-block'
                 }),
-                html.A("Lire l'article complet",
-                       href=row.get('link', '#'),
-                       target="_blank",
-                       style={
-                           'color': config.COLORS['secondary'],
-                           'font-size': '13px',
-                           'text-decoration': 'none',
-                           'font-weight': '500',
-                           'border': f'1px solid {config.COLORS["secondary"]}',
-                           'padding': '6px 12px',
-                           'border-radius': '6px',
-                           'display': 'inline-block',
-                           'transition': 'all 0.2s'
-                       }) if pd.notna(row.get('link')) else html.Span(),
-                html.Br() if pd.notna(row.get('link')) else html.Span(),
-                html.Br() if pd.notna(row.get('link')) else html.Span(),
-                html.P(f" Publié le {row['published'].strftime('%d/%m/%Y')}", style={
-                    'margin': '12px 0 0 0',
+                html.Span(row['sentiment'], style={
+                    'background': sentiment_color,
+                    'color': 'white',
+                    'padding': '8px 16px',
+                    'border-radius': '20px',
                     'font-size': '12px',
-                    'color': config.COLORS['text_light'],
-                    'font-style': 'italic'
+                    'margin-left': '12px',
+                    'font-weight': '500',
+                    'display': 'inline-block'
                 })
-            ], style={
-                'background': config.COLORS['card_bg'],
-                'padding': '24px',
-                'border-radius': '12px',
-                'box-shadow': '0 4px 12px rgba(59, 130, 246, 0.08)',
-                'margin-bottom': '20px',
-                'border-left': f'5px solid {sentiment_color}',
-                'border': f'1px solid {config.COLORS["border"]}',
-                'transition': 'transform 0.2s ease, box-shadow 0.2s ease'
-            })
-        )
-    return items
+            ], style={'display': 'inline-block'}),
+            html.Button(
+                '❤️' if favorited else '🤍',
+                id={'type': 'favorite-btn', 'index': unique_id},
+                style={
+                    'background': 'none',
+                    'border': 'none',
+                    'fontSize': '20px',
+                    'cursor': 'pointer',
+                    'float': 'right',
+                    'padding': '5px 10px',
+                    'borderRadius': '50%',
+                    'transition': 'transform 0.2s ease'
+                },
+                title='Ajouter aux favoris' if not favorited else 'Retirer des favoris'
+            )
+        ], style={'margin-bottom': '15px', 'display': 'flex', 'justify-content': 'space-between', 'align-items': 'center'}),
+        html.H4(row['title'], style={
+            'margin': '0 0 12px 0',
+            'font-size': '18px',
+            'color': config.COLORS['primary'],
+            'line-height': '1.4',
+            'font-weight': '600'
+        }),
+        html.P(row['mini_resume'], style={
+            'margin': '0 0 12px 0',
+            'font-size': '14px',
+            'color': config.COLORS['text'],
+            'line-height': '1.6'
+        }),
+        html.A("Lire l'article complet",
+               href=row.get('link', '#'),
+               target="_blank",
+               style={
+                   'color': config.COLORS['secondary'],
+                   'font-size': '13px',
+                   'text-decoration': 'none',
+                   'font-weight': '500',
+                   'border': f'1px solid {config.COLORS["secondary"]}',
+                   'padding': '6px 12px',
+                   'border-radius': '6px',
+                   'display': 'inline-block',
+                   'transition': 'all 0.2s'
+               }) if pd.notna(row.get('link')) else html.Span(),
+        html.Br() if pd.notna(row.get('link')) else html.Span(),
+        html.Br() if pd.notna(row.get('link')) else html.Span(),
+        html.P(f" Publié le {row['published_day']}", style={
+            'margin': '12px 0 0 0',
+            'font-size': '12px',
+            'color': config.COLORS['text_light'],
+            'font-style': 'italic'
+        })
+    ], style={
+        'background': config.COLORS['card_bg'],
+        'padding': '24px',
+        'border-radius': '12px',
+        'box-shadow': '0 4px 12px rgba(59, 130, 246, 0.08)',
+        'margin-bottom': '20px',
+        'border-left': f'5px solid {sentiment_color}',
+        'border': f'1px solid {config.COLORS["border"]}',
+        'transition': 'transform 0.2s ease, box-shadow 0.2s ease'
+    })
 
 
 def create_stock_news_items_with_favorites(df):
@@ -156,138 +212,128 @@ def create_stock_news_items_with_favorites(df):
         ]
 
     items = []
+    rows = _card_records(df)
+    # Check which articles are favorited (using stock favorites)
+    favorite_flags = stock_service.are_stock_favorited((row['title'], row['published_str']) for row in rows)
 
-    for i, (idx, row) in enumerate(df.iterrows()):
-        sentiment_color = {
-            'Haussier': config.COLORS['success'],
-            'Baissier': config.COLORS['danger'],
-            'Neutre': config.COLORS['neutral']
-        }.get(row['sentiment'], config.COLORS['neutral'])
+    for row, favorited in zip(rows, favorite_flags):
+        # Create unique identifier using title + published date
+        unique_id = row['article_id']
+        items.append(stock_news_card_cache.get(
+            (unique_id, favorited), row,
+            lambda: _build_stock_news_card(row, unique_id, favorited)
+        ))
+    return items
 
-        # Check if this article is favorited (using stock favorites)
-        favorited = stock_service.is_stock_favorited(row['title'], row['published'].strftime('%Y-%m-%d %H:%M:%S'))
 
-        # Create unique identifier using title + published date
-        unique_id = f"{row['title']}_{row['published'].strftime('%Y-%m-%d %H:%M:%S').replace('-', '').replace(':', '').replace(' ', '_')}"
+def _build_stock_news_card(row, unique_id, favorited):
+    """Render one stock news card"""
+    sentiment_color = {
+        'Haussier': config.COLORS['success'],
+        'Baissier': config.COLORS['danger'],
+        'Neutre': config.COLORS['neutral']
+    }.get(row['sentiment'], config.COLORS['neutral'])
 
-        items.append(
+    return html.Div([
+        # En-tête avec badges stock et sentiment + bouton favori
+        html.Div([
             html.Div([
-                # En-tête avec badges stock et sentiment + bouton favori
-                html.Div([
-                    html.Div([
-                        html.Span(row['stock'], style={
-                            'background': config.COLORS['primary'],
-                            'color': 'white',
-                            'padding': '6px 12px',
-                            'border-radius': '15px',
-                            'font-size': '12px',
-                            'font-weight': '600',
-                            'display': 'inline-block'
-                        }),
-                        html.Span(row['sentiment'], style={
-                            'background': sentiment_color,
-                            'color': 'white',
-                            'padding': '6px 12px',
-                            'border-radius': '15px',
-                            'font-size': '12px',
-                            'margin-left': '10px',
-                            'font-weight': '500',
-                            'display': 'inline-block'
-                        })
-                    ], style={'display': 'inline-block'}),
-
-                    # Favorite button
-                    html.Button(
-                        '❤️' if favorited else '🤍',
-                        id={'type': 'stock-favorite-btn', 'index': unique_id},
-                        style={
-                            'background': 'none',
-                            'border': 'none',
-                            'fontSize': '18px',
-                            'cursor': 'pointer',
-                            'float': 'right',
-                            'padding': '5px 10px',
-                            'borderRadius': '50%',
-                            'transition': 'transform 0.2s ease'
-                        },
-                        title='Ajouter aux favoris' if not favorited else 'Retirer des favoris'
-                    )
-                ], style={'margin-bottom': '12px', 'display': 'flex', 'justify-content': 'space-between',
-                          'align-items': 'center'}),
-
-                # Store article data as hidden div
-                html.Div(
-                    id={'type': 'stock-article-data', 'index': unique_id},
-                    children=str({
-                        'stock': row['stock'],
-                        'source': row.get('source', ''),
-                        'title': row['title'],
-                        'mini_resume': row.get('mini_resume', row.get('summary', '')),
-                        'sentiment': row['sentiment'],
-                        'published': row['published'].strftime('%Y-%m-%d %H:%M:%S'),
-                        'link': row.get('link', '')
-                    }),
-                    style={'display': 'none'}
-                ),
-
-                # Titre de l'article
-                html.H4(row['title'], style={
-                    'margin': '0 0 10px 0',
-                    'font-size': '16px',
-                    'color': config.COLORS['primary'],
-                    'line-height': '1.4',
-                    'font-weight': '600'
+                html.Span(row['stock'], style={
+                    'background': config.COLORS['primary'],
+                    'color': 'white',
+                    'padding': '6px 12px',
+                    'border-radius': '15px',
+                    'font-size': '12px',
+                    'font-weight': '600',
+                    'display': 'inline-block'
                 }),
+                html.Span(row['sentiment'], style={
+                    'background': sentiment_color,
+                    'color': 'white',
+                    'padding': '6px 12px',
+                    'border-radius': '15px',
+                    'font-size': '12px',
+                    'margin-left': '10px',
+                    'font-weight': '500',
+                    'display': 'inline-block'
+                })
+            ], style={'display': 'inline-block'}),
 
-                # Source
-                html.P(f"Source: {row.get('source', 'N/A')}", style={
-                    'margin': '0 0 10px 0',
-                    'font-size': '13px',
-                    'color': config.COLORS['neutral'],
-                    'font-style': 'italic'
-                }),
+            # Favorite button
+            html.Button(
+                '❤️' if favorited else '🤍',
+                id={'type': 'stock-favorite-btn', 'index': unique_id},
+                style={
+                    'background': 'none',
+                    'border': 'none',
+                    'fontSize': '18px',
+                    'cursor': 'pointer',
+                    'float': 'right',
+                    'padding': '5px 10px',
+                    'borderRadius': '50%',
+                    'transition': 'transform 0.2s ease'
+                },
+                title='Ajouter aux favoris' if not favorited else 'Retirer des favoris'
+            )
+        ], style={'margin-bottom': '12px', 'display': 'flex', 'justify-content': 'space-between',
+                  'align-items': 'center'}),
 
-                # Résumé de l'article
-                html.P(row.get('mini_resume', row.get('summary', '')), style={
-                    'margin': '0 0 12px 0',
-                    'font-size': '14px',
-                    'color': config.COLORS['text'],
-                    'line-height': '1.6'
-                }),
+        # Titre de l'article
+        html.H4(row['title'], style={
+            'margin': '0 0 10px 0',
+            'font-size': '16px',
+            'color': config.COLORS['primary'],
+            'line-height': '1.4',
+            'font-weight': '600'
+        }),
 
-                # Lien vers l'article complet
-                html.A("Lire l'article complet",
-                       href=row.get('link', '#'),
-                       target="_blank",
-                       style={
-                           'color': config.COLORS['secondary'],
-                           'font-size': '13px',
-                           'text-decoration': 'none',
-                           'font-weight': '500',
-                           'border': f'1px solid {config.COLORS["secondary"]}',
-                           'padding': '6px 12px',
-                           'border-radius': '6px',
-                           'display': 'inline-block',
-                           'transition': 'all 0.2s'
-                       }) if pd.notna(row.get('link')) else html.Span(),
-
-                html.Br() if pd.notna(row.get('link')) else html.Span(),
-
-                # Date de publication
-                html.P(row['published'].strftime('%d/%m/%Y %H:%M'), style={
-                    'margin': '8px 0 0 0',
-                    'font-size': '12px',
-                    'color': config.COLORS['neutral']
-                })
-            ], style={
-                'background': 'white',
-                'padding': '20px',
-                'border-radius': '10px',
-                'box-shadow': '0 2px 8px rgba(0,0,0,0.06)',
-                'margin-bottom': '15px',
-                'border-left': f'4px solid {sentiment_color}',
-                'border': f'1px solid {config.COLORS["border"]}',
-                'transition': 'transform 0.2s ease'
-            })
-        )
-    return items
+        # Source
+        html.P(f"Source: {row.get('source', 'N/A')}", style={
+            'margin': '0 0 10px 0',
+            'font-size': '13px',
+            'color': config.COLORS['neutral'],
+            'font-style': 'italic'
+        }),
+
+        # Résumé de l'article
+        html.P(row.get('mini_resume', row.get('summary', '')), style={
+            'margin': '0 0 12px 0',
+            'font-size': '14px',
+            'color': config.COLORS['text'],
+            'line-height': '1.6'
+        }),
+
+        # Lien vers l'article complet
+        html.A("Lire l'article complet",
+               href=row.get('link', '#'),
+               target="_blank",
+               style={
+                   'color': config.COLORS['secondary'],
+                   'font-size': '13px',
+                   'text-decoration': 'none',
+                   'font-weight': '500',
+                   'border': f'1px solid {config.COLORS["secondary"]}',
+                   'padding': '6px 12px',
+                   'border-radius': '6px',
+                   'display': 'inline-block',
+                   'transition': 'all 0.2s'
+               }) if pd.notna(row.get('link')) else html.Span(),
+
+        html.Br() if pd.notna(row.get('link')) else html.Span(),
+
+        # Date de publication
+        html.P(row['published_minute'], style={
+            'margin': '8px 0 0 0',
+            'font-size': '12px',
+            'color': config.COLORS['neutral']
+        })
+    ], style={
+        'background': 'white',
+        'padding': '20px',
+        'border-radius': '10px',
+        'box-shadow': '0 2px 8px rgba(0,0,0,0.06)',
+        'margin-bottom': '15px',
+        'border-left': f'4px solid {sentiment_color}',
+        'border': f'1px solid {config.COLORS["border"]}',
+        'transition': 'transform 0.2s ease'
+    })
@@ -60,4 +60,36 @@ class Config:
     
     def get_favorites_path(self):
         """Get favorites CSV file path"""
-        return self.config.get('paths', {}).get('favorites', '/Users/mac/Sentiment Analysis Press/app/my_eco_news.csv')
\ No newline at end of file
+        return self.config.get('paths', {}).get('favorites', '/Users/mac/Sentiment Analysis Press/app/my_eco_news.csv')
+
+    def get_cache_dir(self):
+        """Get directory for binary sidecar caches of the data sources"""
+        return self.config.get('paths', {}).get('cache_dir', 'cache')
+
+    def get_favorites_db_path(self):
+        """Get SQLite database file path of the saved articles"""
+        return self.config.get('paths', {}).get('favorites_db', 'favorites.db')
+
+    def get_warm_up_pages(self):
+        """Whether page data is loaded in the background at startup instead of on first visit"""
+        return bool(self.config.get('app', {}).get('warm_up_pages', False))
+
+    def get_refresh_enabled(self):
+        """Whether the data sources are refreshed by the background scheduler"""
+        return bool(self.config.get('refresh', {}).get('enabled', False))
+
+    def get_refresh_interval(self, source, default=300):
+        """Seconds between two background refreshes of a data source"""
+        return self.config.get('refresh', {}).get('intervals', {}).get(source, default)
+
+    def get_pdf_server_url(self):
+        """Get base URL of the FastAPI service rendering the PDF reports"""
+        return self.config.get('api', {}).get('pdf_server_url', 'http://localhost:8000')
+
+    def get_report_template_version(self):
+        """Get version of the PDF template, part of the cached reports' key"""
+        return self.config.get('reports', {}).get('template_version', 1)
+
+    def get_report_cache_max_bytes(self):
+        """Get disk space allowed for the cached PDF reports"""
+        return int(self.config.get('reports', {}).get('cache_max_mb', 200) * 1024 * 1024)
@@ -0,0 +1,65 @@
+# models/database.py
+import os
+import sqlite3
+import threading
+
+# Applied to every new connection
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',       # readers do not block the writer
+    'synchronous': 'NORMAL',     # safe with WAL, fsync only at checkpoints
+    'temp_store': 'MEMORY',
+    'cache_size': -8000,         # 8 MB page cache per connection
+    'busy_timeout': 5000         # wait for a concurrent writer instead of failing
+}
+
+# Prepared statements kept per connection (sqlite3's default is 128)
+CACHED_STATEMENTS = 256
+
+
+class ConnectionPool:
+    """One long-lived SQLite connection per thread for a database file.
+
+    Connections are opened lazily, configured once with DEFAULT_PRAGMAS and
+    reused by every later query of the same thread, so prepared statements
+    stay in sqlite3's statement cache. A connection inherited through fork()
+    is never reused by the child process.
+    """
+
+    def __init__(self, db_path, pragmas=None, cached_statements=CACHED_STATEMENTS):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+
+    def connection(self):
+        """Get the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=self.cached_statements)
+            for name, value in self.pragmas.items():
+                conn.execute(f'PRAGMA {name}={value}')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def close(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            if self._local.pid == os.getpid():
+                conn.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path):
+    """Get the shared pool of a database file"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(db_path)
+        return pool
@@ -2,8 +2,16 @@
 import sqlite3
 import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from flask_login import UserMixin
 from datetime import datetime
+from models.database import get_connection_pool
+
+# Seconds a loaded user is served from memory before the database is read again
+USER_CACHE_TTL = 60
+USER_CACHE_SIZE = 1024
 
 
 class User(UserMixin):
@@ -38,14 +46,72 @@ class User(UserMixin):
         return hashlib.sha256(password.encode()).hexdigest() == password_hash
 
 
+class UserCache:
+    """Bounded TTL cache of User objects keyed by (database, user id).
+
+    Flask-Login loads the current user on every callback request; this keeps
+    a page view with many callbacks down to one query. Entries expire after
+    USER_CACHE_TTL seconds and are dropped right away when UserManager changes
+    the user in this process.
+    """
+
+    def __init__(self, ttl=USER_CACHE_TTL, max_size=USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._users.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._users.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._users[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, user):
+        with self._lock:
+            self._users[key] = (time.monotonic() + self.ttl, user)
+            self._users.move_to_end(key)
+            while len(self._users) > self.max_size:
+                self._users.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._users.pop(key, None)
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'size': len(self._users)
+            }
+
+
+# Shared by every UserManager of the process
+user_cache = UserCache()
+
+
 class UserManager:
     def __init__(self, db_path='../Bmce_News.db'):
         self.db_path = db_path
+        # Per-thread connections shared by every UserManager on this database
+        self.pool = get_connection_pool(db_path)
         self.init_db()
 
     def init_db(self):
         """Initialize the database with users table"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.pool.connection()
         cursor = conn.cursor()
 
         cursor.execute('''
@@ -123,24 +189,22 @@ class UserManager:
                        ''')
 
         conn.commit()
-        conn.close()
 
     def create_user(self, username, email, password):
         """Create a new user"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
             password_hash = User.hash_password(password)
 
-            cursor.execute('''
-                           INSERT INTO users (username, email, password_hash)
-                           VALUES (?, ?, ?)
-                           ''', (username, email, password_hash))
-
-            conn.commit()
+            # Commits, or rolls back so a failed write does not keep the shared connection locked
+            with conn:
+                cursor.execute('''
+                               INSERT INTO users (username, email, password_hash)
+                               VALUES (?, ?, ?)
+                               ''', (username, email, password_hash))
             user_id = cursor.lastrowid
-            conn.close()
 
             return self.get_user_by_id(user_id)
         except sqlite3.IntegrityError as e:
@@ -153,7 +217,7 @@ class UserManager:
     def get_user_by_id(self, user_id):
         """Get user by ID"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -163,7 +227,6 @@ class UserManager:
                            ''', (user_id,))
 
             row = cursor.fetchone()
-            conn.close()
 
             if row:
                 # Unpack the row data properly
@@ -174,10 +237,50 @@ class UserManager:
             print(f"Error getting user by ID: {e}")
             return None
 
+    def _cache_key(self, user_id):
+        return os.path.abspath(self.db_path), int(user_id)
+
+    def get_cached_user(self, user_id):
+        """Get user by ID, served from the in-process user cache when possible"""
+        key = self._cache_key(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            user = self.get_user_by_id(user_id)
+            if user is not None:
+                user_cache.put(key, user)
+        return user
+
+    def set_user_active(self, user_id, active):
+        """Activate or deactivate a user"""
+        try:
+            conn = self.pool.connection()
+            with conn:
+                conn.execute('UPDATE users SET is_active = ? WHERE id = ?', (1 if active else 0, user_id))
+            return True
+        except Exception as e:
+            print(f"Error updating user status: {e}")
+            return False
+        finally:
+            user_cache.invalidate(self._cache_key(user_id))
+
+    def update_password(self, user_id, new_password):
+        """Change a user's password"""
+        try:
+            conn = self.pool.connection()
+            with conn:
+                conn.execute('UPDATE users SET password_hash = ? WHERE id = ?',
+                             (User.hash_password(new_password), user_id))
+            return True
+        except Exception as e:
+            print(f"Error updating password: {e}")
+            return False
+        finally:
+            user_cache.invalidate(self._cache_key(user_id))
+
     def get_user_by_username(self, username):
         """Get user by username"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -187,7 +290,6 @@ class UserManager:
                            ''', (username,))
 
             row = cursor.fetchone()
-            conn.close()
 
             if row:
                 # Unpack the row data properly
@@ -201,7 +303,7 @@ class UserManager:
     def get_user_by_email(self, email):
         """Get user by email"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -211,7 +313,6 @@ class UserManager:
                            ''', (email,))
 
             row = cursor.fetchone()
-            conn.close()
 
             if row:
                 # Unpack the row data properly
@@ -236,16 +337,14 @@ class UserManager:
     def add_favorite(self, user_id, article_id, article_title, article_url):
         """Add article to user favorites"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
-            cursor.execute('''
-                           INSERT INTO user_favorites (user_id, article_id, article_title, article_url)
-                           VALUES (?, ?, ?, ?)
-                           ''', (user_id, article_id, article_title, article_url))
-
-            conn.commit()
-            conn.close()
+            with conn:
+                cursor.execute('''
+                               INSERT INTO user_favorites (user_id, article_id, article_title, article_url)
+                               VALUES (?, ?, ?, ?)
+                               ''', (user_id, article_id, article_title, article_url))
             return True
         except sqlite3.IntegrityError:
             # Article already in favorites
@@ -257,18 +356,16 @@ class UserManager:
     def remove_favorite(self, user_id, article_id):
         """Remove article from user favorites"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
-            cursor.execute('''
-                           DELETE
-                           FROM user_favorites
-                           WHERE user_id = ?
-                             AND article_id = ?
-                           ''', (user_id, article_id))
-
-            conn.commit()
-            conn.close()
+            with conn:
+                cursor.execute('''
+                               DELETE
+                               FROM user_favorites
+                               WHERE user_id = ?
+                                 AND article_id = ?
+                               ''', (user_id, article_id))
             return True
         except Exception as e:
             print(f"Error removing favorite: {e}")
@@ -277,7 +374,7 @@ class UserManager:
     def get_user_favorites(self, user_id):
         """Get user's favorite articles"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -288,7 +385,6 @@ class UserManager:
                            ''', (user_id,))
 
             rows = cursor.fetchall()
-            conn.close()
 
             return rows
         except Exception as e:
@@ -298,7 +394,7 @@ class UserManager:
     def is_favorite(self, user_id, article_id):
         """Check if article is in user's favorites"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.connection()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -309,7 +405,6 @@ class UserManager:
                            ''', (user_id, article_id))
 
             count = cursor.fetchone()[0]
-            conn.close()
 
             return count > 0
         except Exception as e:
@@ -1,5 +1,6 @@
 # pages/bourse.py
 import io
+import os
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -9,6 +10,9 @@ import plotly.graph_objects as go
 import yaml
 from dash import Input, Output, callback, dash_table, dcc, html
 from plotly.subplots import make_subplots
+from services.data_cache import read_csv_cached
+from services.lazy_data import lazy_data
+from services.parsing import EUROPEAN_CSV_OPTIONS, parse_dates, parse_european_numbers
 
 # Palette de couleurs unifiée autour du bleu
 UNIFIED_COLORS = {
@@ -46,6 +50,9 @@ except FileNotFoundError:
     print("Warning: config.yaml not found, using default configuration")
     config = {}
 
+HISTORICAL_DATA_PATH = '/Users/mac/Sentiment Analysis Press/stocks/Historical_Stock_Data.csv'
+INDICES_DATA_PATH = '/Users/mac/Sentiment Analysis Press/stock_indices_data_28_07_2025.csv'
+
 def debug_number_conversion():
     """Debug function to test number conversion"""
     test_values = ['37,84', '1 390,00', '1390,00', '37.84', '1390.00']
@@ -74,31 +81,33 @@ def debug_number_conversion():
 # Call this function to debug
 # debug_number_conversion()
 
-def parse_date(date_str):
-    """Parse date string in various formats"""
-    try:
-        # Try common formats
-        for fmt in ['%d/%m/%Y', '%Y-%m-%d', '%m/%d/%Y']:
-            try:
-                return pd.to_datetime(date_str, format=fmt)
-            except ValueError:
-                continue
-        # If none work, let pandas try to infer
-        return pd.to_datetime(date_str, dayfirst=True)
-    except:
-        return pd.NaT
+def clean_numeric_columns(df, columns):
+    """Convert European formatted number columns ("1 390,84") to floats"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = parse_european_numbers(df[col])
+    return df
+
+def prepare_historical_data(historical_data):
+    """Parse dates and numbers of the raw historical quotes"""
+    historical_data['Date'] = parse_dates(historical_data['Date'])
+    historical_data = historical_data.dropna(subset=['Date'])
+    historical_data = historical_data.sort_values(['Date', 'Valeur'])
+    return clean_numeric_columns(historical_data, ['VMC', 'QE', 'CCA', 'CCV'])
+
+def prepare_indices_data(indices_data):
+    """Parse dates and numbers of the raw indices quotes"""
+    if 'Date' in indices_data.columns:
+        indices_data['Date'] = parse_dates(indices_data['Date'])
+    return clean_numeric_columns(indices_data, ['CCA', 'CCV'])
 
 def load_and_process_data():
     """Charge et traite les données des fichiers CSV historiques"""
     
     try:
-        # Load historical stock data
-        historical_data = pd.read_csv('/Users/mac/Sentiment Analysis Press/stocks/Historical_Stock_Data.csv')
-        
-        # Clean and parse dates
-        historical_data['Date'] = historical_data['Date'].apply(parse_date)
-        historical_data = historical_data.dropna(subset=['Date'])
-        historical_data = historical_data.sort_values(['Date', 'Valeur'])
+        # Load historical stock data, parsed and cleaned through the binary cache
+        historical_data = read_csv_cached(HISTORICAL_DATA_PATH,
+                                          prepare=prepare_historical_data, **EUROPEAN_CSV_OPTIONS)
         
         print(f"Loaded {len(historical_data)} historical records")
         
@@ -125,12 +134,11 @@ def load_and_process_data():
     
     try:
         # Load current indices data
-        indices_data = pd.read_csv('/Users/mac/Sentiment Analysis Press/stock_indices_data_28_07_2025.csv')
+        indices_data = read_csv_cached(INDICES_DATA_PATH,
+                                       prepare=prepare_indices_data, **EUROPEAN_CSV_OPTIONS)
         
-        # Parse the date if it exists
-        if 'Date' in indices_data.columns:
-            indices_data['Date'] = indices_data['Date'].apply(parse_date)
-        else:
+        # Without a Date column the quotes are today's (not cached, it changes daily)
+        if 'Date' not in indices_data.columns:
             indices_data['Date'] = pd.Timestamp.now().date()
             
         print(f"Loaded {len(indices_data)} current indices records")
@@ -145,43 +153,35 @@ def load_and_process_data():
             'CCV': [19266.33, 1583.50, 1329.27, 1823.32, 37593.45, 6349.56]
         })
     
-    # Clean numeric columns for historical data
-    def clean_numeric_columns(df, columns):
-        for col in columns:
-            if col in df.columns:
-                # Handle European number format (space as thousands separator, comma as decimal)
-                df[col] = df[col].astype(str)
-                
-                # Remove any leading/trailing whitespace
-                df[col] = df[col].str.strip()
-                
-                # Handle empty strings and NaN
-                df[col] = df[col].replace('', '0')
-                df[col] = df[col].replace('nan', '0')
-                df[col] = df[col].replace('NaN', '0')
-                
-                # Convert European format: "1 390,84" -> "1390.84"
-                # First remove spaces (thousands separator)
-                df[col] = df[col].str.replace(' ', '')
-                
-                # Then replace comma with dot (decimal separator)  
-                df[col] = df[col].str.replace(',', '.')
-                
-                # Convert to numeric, coerce errors to NaN, then fill NaN with 0
-                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-                
-        return df
-    
-    # Clean historical data
-    historical_data = clean_numeric_columns(historical_data, ['VMC', 'QE', 'CCA', 'CCV'])
-    
-    # Clean indices data
-    indices_data = clean_numeric_columns(indices_data, ['CCA', 'CCV'])
-    
     return historical_data, indices_data
 
+def _percent_change(current, base):
+    """Percentage change from base to current, 0 where base is 0"""
+    base = base.reindex(current.index)
+    return pd.Series(np.where(base != 0, (current / base - 1) * 100, 0), index=current.index)
+
+def _edge_rows(df, name_col, first):
+    """First or last row of each instrument, indexed by instrument name"""
+    groups = df.groupby(name_col, sort=False)
+    rows = groups.head(1) if first else groups.tail(1)
+    rows.index = rows[name_col].values
+    return rows
+
+def _window_change(df, name_col, mask, current, first=True):
+    """Change from the first (or last) row inside a per-instrument window and the window size"""
+    window = df[mask]
+    edge = _edge_rows(window, name_col, first)
+    rows = window.groupby(name_col, sort=False).size().reindex(current.index, fill_value=0)
+    return _percent_change(current, edge['CCA']), rows
+
 def calculate_performance_metrics(df, period='daily'):
-    """Calculate performance metrics for the selected period"""
+    """Calculate performance metrics for the selected period
+
+    All instruments are processed together: the frame is sorted once by
+    (name, Date) and each reference price (previous close, start of the
+    week/month/year, same date last year) is the first or last row of a
+    per-instrument boolean window.
+    """
     
     if df.empty:
         return df
@@ -193,115 +193,77 @@ def calculate_performance_metrics(df, period='daily'):
     
     # Group by stock/indice name for calculations
     name_col = 'Valeur' if 'Valeur' in df.columns else 'Indice'
-    
-    result_data = []
-    
-    for name in df[name_col].unique():
-        stock_data = df[df[name_col] == name].sort_values('Date')
-        
-        if len(stock_data) == 0:
-            continue
-            
-        # Get the most recent data point
-        latest = stock_data.iloc[-1].copy()
-        
-        # Calculate daily performance (most recent vs previous day)
-        if len(stock_data) >= 2:
-            previous = stock_data.iloc[-2]
-            daily_perf = ((latest['CCA'] / previous['CCA']) - 1) * 100 if previous['CCA'] != 0 else 0
-        else:
-            daily_perf = ((latest['CCA'] / latest['CCV']) - 1) * 100 if latest['CCV'] != 0 else 0
-        
-        latest['Performance_Quotidienne'] = daily_perf
-        
-        # Calculate period-specific performance
-        if period == 'weekly':
-            # Performance over last 7 days
-            week_ago = latest['Date'] - timedelta(days=7)
-            week_data = stock_data[stock_data['Date'] >= week_ago].sort_values('Date')
-            if len(week_data) >= 2:
-                oldest_in_period = week_data.iloc[0]
-                period_perf = ((latest['CCA'] / oldest_in_period['CCA']) - 1) * 100 if oldest_in_period['CCA'] != 0 else 0
-                print(f"Weekly calc for {name}: {latest['CCA']} vs {oldest_in_period['CCA']} = {period_perf:.2f}%")
-            else:
-                period_perf = daily_perf
-                
-        elif period == 'monthly':
-            # Performance over last 30 days
-            month_ago = latest['Date'] - timedelta(days=30)
-            month_data = stock_data[stock_data['Date'] >= month_ago].sort_values('Date')
-            if len(month_data) >= 2:
-                oldest_in_period = month_data.iloc[0]
-                period_perf = ((latest['CCA'] / oldest_in_period['CCA']) - 1) * 100 if oldest_in_period['CCA'] != 0 else 0
-                print(f"Monthly calc for {name}: {latest['CCA']} vs {oldest_in_period['CCA']} = {period_perf:.2f}%")
-            else:
-                period_perf = daily_perf
-        else:  # daily
-            period_perf = daily_perf
-        
-        latest['Performance_Periode'] = period_perf
-        
-        # Calculate YTD performance (from January 1st of current year)
-        current_year = latest['Date'].year
-        year_start = pd.Timestamp(f'{current_year}-01-01')
-        ytd_data = stock_data[stock_data['Date'] >= year_start]
-        
-        if len(ytd_data) >= 2:
-            year_start_price = ytd_data.iloc[0]['CCA']
-            ytd_perf = ((latest['CCA'] / year_start_price) - 1) * 100 if year_start_price != 0 else 0
-        else:
-            ytd_perf = 0
-            
-        latest['Performance_YTD'] = ytd_perf
-        
-        # Calculate YoY performance (same date last year)
-        last_year_date = latest['Date'] - timedelta(days=365)
-        yoy_data = stock_data[stock_data['Date'] <= last_year_date]
-        
-        if len(yoy_data) > 0:
-            last_year_price = yoy_data.iloc[-1]['CCA']  # Closest date to last year
-            yoy_perf = ((latest['CCA'] / last_year_price) - 1) * 100 if last_year_price != 0 else 0
-        else:
-            yoy_perf = 0
-            
-        latest['Performance_YoY'] = yoy_perf
-        
-        # Calculate additional metrics for stocks
-        if 'VMC' in latest.index:
-            # Volume and liquidity metrics
-            period_data = stock_data.tail(min(30, len(stock_data)))  # Last 30 days or available data
-            
-            latest['Volume_MC_Global'] = period_data['VMC'].sum()
-            latest['Quantite_Echangee_Global'] = period_data['QE'].sum()
-            latest['Volume_Moyen_Quotidien'] = period_data['VMC'].mean()
-            
-            # Price metrics
-            latest['Cours_Moyen_Pondere'] = (
-                period_data['VMC'].sum() / period_data['QE'].sum() 
-                if period_data['QE'].sum() != 0 else latest['CCA']
-            )
-            latest['Maximum_Cloture'] = period_data['CCA'].max()
-            latest['Minimum_Cloture'] = period_data['CCA'].min()
-        else:
-            # For indices, set basic metrics
-            latest['Maximum_Cloture'] = latest['CCA']
-            latest['Minimum_Cloture'] = latest['CCA']
-        
-        result_data.append(latest)
-    
-    if result_data:
-        result_df = pd.DataFrame(result_data)
-        return result_df.reset_index(drop=True)
+    names = [name for name in pd.unique(df[name_col]) if pd.notna(name)]
+    
+    df = df.sort_values([name_col, 'Date'], kind='mergesort')
+    groups = df.groupby(name_col, sort=False)
+    position = groups.cumcount()
+    size = groups[name_col].transform('size')
+    
+    # Most recent data point of every instrument
+    latest = _edge_rows(df, name_col, first=False).copy()
+    current = latest['CCA']
+    latest_date = df[name_col].map(latest['Date'])
+    
+    # Daily performance (most recent vs previous day, or vs CCV with a single quote)
+    previous = df[position == size - 2]
+    previous.index = previous[name_col].values
+    count = groups.size().reindex(latest.index)
+    daily_perf = pd.Series(np.where(count >= 2, _percent_change(current, previous['CCA']),
+                                    _percent_change(current, latest['CCV'])), index=latest.index)
+    latest['Performance_Quotidienne'] = daily_perf
+    
+    # Period-specific performance over the last 7 or 30 days
+    period_days = {'weekly': 7, 'monthly': 30}.get(period)
+    if period_days:
+        period_perf, period_rows = _window_change(
+            df, name_col, df['Date'] >= latest_date - timedelta(days=period_days), current)
+        latest['Performance_Periode'] = np.where(period_rows >= 2, period_perf, daily_perf)
     else:
-        return pd.DataFrame()
+        latest['Performance_Periode'] = daily_perf
+    
+    # YTD performance (from January 1st of the latest quote's year)
+    year_start = latest_date.dt.to_period('Y').dt.to_timestamp()
+    ytd_perf, ytd_rows = _window_change(df, name_col, df['Date'] >= year_start, current)
+    latest['Performance_YTD'] = np.where(ytd_rows >= 2, ytd_perf, 0)
+    
+    # YoY performance (closest quote on or before the same date last year)
+    yoy_perf, yoy_rows = _window_change(
+        df, name_col, df['Date'] <= latest_date - timedelta(days=365), current, first=False)
+    latest['Performance_YoY'] = np.where(yoy_rows > 0, yoy_perf, 0)
+    
+    # Calculate additional metrics for stocks
+    if 'VMC' in df.columns:
+        # Volume and liquidity metrics over the last 30 quotes
+        period_data = df[position >= size - 30]
+        liquidity = period_data.groupby(name_col, sort=False).agg(
+            vmc_sum=('VMC', 'sum'), qe_sum=('QE', 'sum'), vmc_mean=('VMC', 'mean'),
+            cca_max=('CCA', 'max'), cca_min=('CCA', 'min')
+        ).reindex(latest.index)
+        
+        latest['Volume_MC_Global'] = liquidity['vmc_sum']
+        latest['Quantite_Echangee_Global'] = liquidity['qe_sum']
+        latest['Volume_Moyen_Quotidien'] = liquidity['vmc_mean']
+        
+        # Price metrics
+        latest['Cours_Moyen_Pondere'] = np.where(
+            liquidity['qe_sum'] != 0, liquidity['vmc_sum'] / liquidity['qe_sum'].replace(0, np.nan), current)
+        latest['Maximum_Cloture'] = liquidity['cca_max']
+        latest['Minimum_Cloture'] = liquidity['cca_min']
+    else:
+        # For indices, set basic metrics
+        latest['Maximum_Cloture'] = current
+        latest['Minimum_Cloture'] = current
+    
+    # Keep the instruments in their order of appearance in the input
+    return latest.reindex(names).reset_index(drop=True)
 
-# Load and process data
-historical_data, indices_data = load_and_process_data()
+DATA_TYPES = ['stocks', 'indices_general', 'indices_sectorial']
+PERIODS = ['daily', 'weekly', 'monthly']
 
 # Create processed datasets for different data types
-def get_processed_data(data_type, period='daily'):
-    """Get processed data based on type and period"""
-    
+def compute_processed_data(data_type, period, historical_data, indices_data):
+    """Compute processed data based on type and period"""
     if data_type == 'stocks':
         # Use historical stock data
         df = historical_data.copy()
@@ -323,6 +285,41 @@ def get_processed_data(data_type, period='daily'):
     
     return pd.DataFrame()
 
+def load_market_data():
+    """Load the CSV files and compute every (data type, period) performance table from them"""
+    historical_data, indices_data = load_and_process_data()
+    tables = {
+        (data_type, period): compute_processed_data(data_type, period, historical_data, indices_data)
+        for data_type in DATA_TYPES
+        for period in PERIODS
+    }
+    return historical_data, indices_data, tables
+
+# Historical and indices data with their performance tables, loaded on first use or by the warm-up
+market_data = lazy_data('bourse', load_market_data)
+
+def reload_data():
+    """Reload the CSV files and rebuild the performance tables
+
+    The sample data only stands in on first load: a missing file raises
+    here and the current data is kept.
+    """
+    for path in (HISTORICAL_DATA_PATH, INDICES_DATA_PATH):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"File not found: {path}")
+    market_data.reload()
+
+def get_processed_data(data_type, period='daily'):
+    """Get processed data based on type and period
+
+    Tables are shared between callbacks and must not be modified in place.
+    """
+    historical_data, indices_data, tables = market_data.get()
+    df = tables.get((data_type, period))
+    if df is None:
+        df = compute_processed_data(data_type, period, historical_data, indices_data)
+    return df
+
 # Functions for creating tab content (keeping the same structure but using processed data)
 def create_overview_tab(df, data_type, period='daily'):
     if df.empty:
@@ -723,6 +720,7 @@ layout = html.Div([
 )
 def update_sector_filter(data_type):
     """Update sector filter options based on data type"""
+    historical_data, indices_data, _ = market_data.get()
     if data_type == 'stocks':
         # Get unique stock names from historical data
         unique_stocks = historical_data['Valeur'].unique() if not historical_data.empty else []
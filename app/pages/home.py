@@ -4,7 +4,7 @@ from dash import dcc, html
 from flask_login import current_user
 from components.media_banner import create_media_banner
 from components.news_components import create_news_items_with_favorites
-from services.eco_service import EcoService
+from services.eco_service import EcoService, NEWS_PAGE_SIZE
 from config.settings import Config
 from models.user import UserManager
 from datetime import date, timedelta
@@ -15,24 +15,23 @@ config = Config()
 user_manager = UserManager()
 
 def layout():
-    # Load initial data
-    news_df = eco_service.load_news_data()
-
     # Default date range (last week)
     today = date.today()
     week_ago = today - timedelta(days=7)
-    if not news_df.empty:
-        default_filtered_df = news_df[news_df['published'] >= pd.to_datetime(week_ago)]
-    else:
-        default_filtered_df = pd.DataFrame()
+
+    # Shared indexed snapshot, loaded once per process; only the first page is rendered
+    snapshot, ids = eco_service.filter_news_ids(period_value='week')
+    page_ids = ids[:NEWS_PAGE_SIZE]
+    load_more_style, load_more_label = eco_service.get_load_more_button(len(page_ids), len(ids))
 
     # Create initial components
-    sentiment_fig = eco_service.create_sentiment_chart(default_filtered_df)
-    theme_fig = eco_service.create_theme_chart(default_filtered_df)
-    news_items = create_news_items_with_favorites(default_filtered_df)
+    sentiment_fig = eco_service.create_sentiment_chart(sentiment_counts=snapshot.counts('sentiment', ids))
+    theme_fig = eco_service.create_theme_chart(theme_counts=snapshot.counts('theme', ids))
+    news_items = create_news_items_with_favorites(snapshot.rows(page_ids))
     date_options = eco_service.get_date_range_options()
+    sort_options = eco_service.get_sort_options()
     theme_options = [{'label': 'Tous les thèmes', 'value': 'Tous'}] + \
-                    [{'label': theme, 'value': theme} for theme in sorted(news_df['theme'].dropna().unique())] if not news_df.empty else []
+                    [{'label': theme, 'value': theme} for theme in sorted(snapshot.categories.get('theme', []))] if not snapshot.empty else []
 
     # Welcome message for authenticated users
     welcome_message = html.Div()
@@ -129,6 +128,16 @@ def layout():
                                     style={'width': '200px'}
                                 )
                             ], style={'display': 'inline-block', 'marginRight': '20px', 'verticalAlign': 'top'}),
+                            html.Div([
+                                html.Label('Tri:', style={'fontSize': '14px', 'fontWeight': '600', 'color': config.COLORS['text'], 'marginBottom': '5px', 'display': 'block'}),
+                                dcc.Dropdown(
+                                    id='sort-order-dropdown',
+                                    options=sort_options,
+                                    value='date',
+                                    clearable=False,
+                                    style={'width': '200px'}
+                                )
+                            ], style={'display': 'inline-block', 'marginRight': '20px', 'verticalAlign': 'top'}),
                             html.Div([
                                 html.Div([
                                     html.Label('Du:', style={'fontSize': '14px', 'fontWeight': '600', 'color': config.COLORS['text'], 'marginBottom': '5px', 'display': 'block'}),
@@ -153,7 +162,14 @@ def layout():
                         'padding': '20px',
                         'background': config.COLORS['background']
                     }
-                )
+                ),
+                html.Button(
+                    load_more_label,
+                    id='load-more-news-btn',
+                    n_clicks=0,
+                    style=load_more_style
+                ),
+                dcc.Store(id='news-page-store', data=eco_service.news_page_state(snapshot, ids, page_ids))
             ], style={
                 'background': config.COLORS['card_bg'], 'padding': '30px', 'border-radius': '16px',
                 'box-shadow': '0 8px 24px rgba(59, 130, 246, 0.12)', 'border': f'1px solid {config.COLORS["border"]}',
@@ -1,18 +1,20 @@
 # pages/my_articles.py
 
 import json
-import os
+import threading
 from datetime import datetime
 
 import pandas as pd
-import requests
-import yaml
-from dash import (ALL, Input, Output, State, callback, callback_context, dcc,
+from config.settings import Config
+from dash import (ALL, Input, Output, Patch, State, callback, callback_context, dcc,
                   html, no_update)
+from services.article_ids import article_ids
+from services.favorites_store import eco_favorites_store, stock_favorites_store
+from services.report_cache import report_cache, report_key
+from services.report_jobs import download_pdf, report_jobs, request_pdf
 
 # Load config
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
+config = Config()
 
 # Schéma de couleurs centré sur le bleu
 COLORS = {
@@ -29,60 +31,137 @@ COLORS = {
     'border': '#e2e8f0'
 }
 
-# File paths
-eco_news_file = config['paths'].get('eco_news', 'my_eco_news.csv')
-stock_news_file = config['paths'].get('stock_news', 'my_stock_news.csv')
-
 # FastAPI server URL
-FASTAPI_SERVER_URL = "http://localhost:8000"  # Update this to match your FastAPI server
+FASTAPI_SERVER_URL = config.get_pdf_server_url()
+
+# Version of the PDF template, part of the cached reports' key
+PDF_TEMPLATE_VERSION = config.get_report_template_version()
+
+# Milliseconds between two status checks of a running PDF job
+PDF_JOB_POLL_INTERVAL = 1000
 
-# Function to load CSV files
-def load_csv_data(file_path):
-    if os.path.exists(file_path):
-        try:
-            df = pd.read_csv(file_path)
-            df['published'] = pd.to_datetime(df['published'])
-            # Ensure treated column exists
-            if 'treated' not in df.columns:
-                df['treated'] = False
-            return df.sort_values('published', ascending=False)
-        except:
+# Function to load saved articles
+def load_saved_articles(store):
+    try:
+        df = store.load()
+        if df.empty:
             return pd.DataFrame()
-    else:
+        df['published'] = pd.to_datetime(df['published'])
+        return df.sort_values('published', ascending=False)
+    except Exception as e:
+        print(f"Error loading saved articles: {e}")
         return pd.DataFrame()
 
-# Function to delete article from CSV
-def delete_article_from_csv(article_title, file_path):
-    if os.path.exists(file_path):
-        try:
-            df = pd.read_csv(file_path)
-            # Remove the article with matching title
-            df = df[df['title'] != article_title]
-            # Save back to CSV
-            df.to_csv(file_path, index=False)
-            return True
-        except Exception as e:
-            print(f"Error deleting article: {e}")
-            return False
-    return False
+# Function to delete a saved article
+def delete_saved_article(article_title, store):
+    try:
+        # Remove the article with matching title
+        return store.remove_by_title(article_title)
+    except Exception as e:
+        print(f"Error deleting article: {e}")
+        return False
 
-# Function to update treated status in CSV
-def update_treated_status(article_titles, file_path):
-    if os.path.exists(file_path):
-        try:
-            df = pd.read_csv(file_path)
-            # Update treated status for selected articles
-            df.loc[df['title'].isin(article_titles), 'treated'] = True
-            # Save back to CSV
-            df.to_csv(file_path, index=False)
-            return True
-        except Exception as e:
-            print(f"Error updating treated status: {e}")
-            return False
-    return False
+# Function to update treated status of saved articles
+def update_treated_status(article_titles, store):
+    try:
+        # Update treated status for selected articles
+        return store.mark_treated(article_titles)
+    except Exception as e:
+        print(f"Error updating treated status: {e}")
+        return False
+
+# Report job task: render the selected articles, unless already cached, and mark them as treated
+def generate_pdf_report(job, key, articles, eco_titles, stock_titles):
+    if report_cache.get(key) is None:
+        result = request_pdf(job, FASTAPI_SERVER_URL, articles)
+        report_cache.put(key, download_pdf(job, result['download_url']))
+    job.update(0.9, 'Mise à jour des articles traités')
+    if eco_titles:
+        update_treated_status(eco_titles, eco_favorites_store)
+    if stock_titles:
+        update_treated_status(stock_titles, stock_favorites_store)
+    return {'articles_count': len(articles), 'download_url': f"/reports/{key}.pdf"}
+
+# Function to identify the card of each saved article, the same across renders
+def article_card_ids(df, section_type):
+    if df.empty:
+        return []
+    return [f"{section_type}-{card_id}" for card_id in article_ids(df['title'], df['published'])]
+
+# Cards last sent for each (section, untreated filter): the store revision they
+# reflect and their [card id, fingerprint] list, in display order. A client
+# showing that revision gets a patch from them; any other gets a full render.
+_rendered_sections = {}
+_rendered_sections_lock = threading.Lock()
+
+# Function to render the saved articles of a section, or patch the rendered ones.
+# Returns the children and the rendered state: the store revision and the
+# filter the client now displays.
+def render_saved_articles(store, section_type, filter_untreated, rendered=None):
+    filter_untreated = bool(filter_untreated)
+    section = (section_type, filter_untreated)
+    with _rendered_sections_lock:
+        # Read before loading, so a write made meanwhile is picked up by the next check
+        revision = store.revision()
+        df = load_saved_articles(store)
+        if store.revision() != revision:
+            # The rows may be newer than the revision: no patch will be based on them
+            revision = None
+        
+        # Apply filter if needed
+        if filter_untreated and not df.empty:
+            df = df[df['treated'] == False]
+        
+        card_ids = article_card_ids(df, section_type)
+        fingerprints = pd.util.hash_pandas_object(df, index=False).astype(str).tolist() if not df.empty else []
+        cards = list(zip(card_ids, fingerprints))
+        
+        patch = None
+        rendered_revision, rendered_cards = _rendered_sections.get(section, (None, None))
+        if rendered and rendered_revision is not None and rendered_cards is not None and \
+                rendered.get('revision') == rendered_revision and rendered.get('filter_untreated') == filter_untreated:
+            patch = patch_article_items(
+                rendered_cards, cards,
+                lambda positions: create_article_items(df.iloc[positions], section_type,
+                                                       [card_ids[position] for position in positions]))
+        _rendered_sections[section] = (revision, cards)
+    
+    if patch is None:
+        patch = create_article_items(df, section_type, card_ids)
+    return patch, {'revision': revision, 'filter_untreated': filter_untreated}
+
+# Function to turn the rendered cards into the new ones: removed cards are
+# deleted, added and changed ones inserted or replaced, and the other cards
+# (with their selection checkbox) are left as they are. Only the added and
+# changed cards are built, by build_items(positions). Returns None when the
+# section must be rendered again.
+def patch_article_items(rendered_cards, cards, build_items):
+    if not rendered_cards or not cards:
+        return None
+    new_ids = {card_id for card_id, _ in cards}
+    rendered_fingerprints = dict(rendered_cards)
+    kept = [card_id for card_id, _ in rendered_cards if card_id in new_ids]
+    if kept != [card_id for card_id, _ in cards if card_id in rendered_fingerprints]:
+        return None
+    
+    removed = [position for position, (card_id, _) in enumerate(rendered_cards) if card_id not in new_ids]
+    updated = [position for position, (card_id, fingerprint) in enumerate(cards)
+               if rendered_fingerprints.get(card_id) != fingerprint]
+    if not removed and not updated:
+        return no_update
+    
+    patch = Patch()
+    for position in reversed(removed):
+        del patch[position]
+    for position, item in zip(updated, build_items(updated)):
+        if cards[position][0] in rendered_fingerprints:
+            patch[position] = item
+        else:
+            patch.insert(position, item)
+    return patch
 
 # Function to create article items
-def create_article_items(df, section_type):
+def create_article_items(df, section_type, card_ids=None):
     if df.empty:
         return [html.Div([
             html.P("Aucun article pour le moment.",
@@ -94,8 +173,11 @@ def create_article_items(df, section_type):
                    })
         ])]
     
+    if card_ids is None:
+        card_ids = article_card_ids(df, section_type)
+    
     items = []
-    for index, row in df.iterrows():
+    for card_id, row in zip(card_ids, df.to_dict('records')):
         sentiment_color = {
             'Positif': COLORS['success'],
             'Haussier': COLORS['success'],
@@ -130,7 +212,7 @@ def create_article_items(df, section_type):
                     html.Div([
                         # Selection checkbox
                         dcc.Checklist(
-                            id={'type': 'article-select', 'index': f"{section_type}-{index}"},
+                            id={'type': 'article-select', 'index': card_id},
                             options=[{'label': 'Sélectionner', 'value': 'selected'}],
                             value=[],
                             style={
@@ -180,7 +262,7 @@ def create_article_items(df, section_type):
                         html.I(className="fas fa-trash-alt", style={'margin-right': '5px'}),
                         "Supprimer"
                     ], 
-                    id={'type': 'delete-btn', 'index': f"{section_type}-{index}"},
+                    id={'type': 'delete-btn', 'index': card_id},
                     style={
                         'background': COLORS['danger'],
                         'color': 'white',
@@ -247,9 +329,9 @@ def create_article_items(df, section_type):
                 
                 # Hidden div to store article data
                 html.Div([
-                    html.Span(row['title'], id={'type': 'article-title', 'index': f"{section_type}-{index}"}),
-                    html.Span(row['mini_resume'], id={'type': 'article-resume', 'index': f"{section_type}-{index}"}),
-                    html.Span(section_type, id={'type': 'article-section', 'index': f"{section_type}-{index}"})
+                    html.Span(row['title'], id={'type': 'article-title', 'index': card_id}),
+                    html.Span(row['mini_resume'], id={'type': 'article-resume', 'index': card_id}),
+                    html.Span(section_type, id={'type': 'article-section', 'index': card_id})
                 ], style={'display': 'none'})
                 
             ], style={
@@ -446,13 +528,26 @@ layout = html.Div([
     # Store for filter state
     dcc.Store(id='filter-untreated', data=False),
     
+    # Store revisions and filters the displayed sections reflect
+    dcc.Store(id='eco-articles-revision', data=None),
+    dcc.Store(id='stock-articles-revision', data=None),
+    
     # Confirmation dialog
     dcc.ConfirmDialog(
         id='confirm-delete-dialog',
         message='Êtes-vous sûr de vouloir supprimer cet article ?',
     ),
     
-    # Interval component for auto-refresh
+    # Running PDF job, polled only while it is not finished
+    dcc.Store(id='pdf-job-store'),
+    dcc.Interval(
+        id='pdf-job-interval',
+        interval=PDF_JOB_POLL_INTERVAL,
+        n_intervals=0,
+        disabled=True
+    ),
+    
+    # Interval component for auto-refresh, re-rendering only the sections that changed
     dcc.Interval(
         id='interval-component',
         interval=60*1000,  # Update every 1 minute
@@ -526,35 +621,37 @@ def toggle_filter(n_clicks, current_filter):
 
 # Callback to load economic articles
 @callback(
-    Output('eco-articles-container', 'children'),
+    [Output('eco-articles-container', 'children'),
+     Output('eco-articles-revision', 'data')],
     [Input('interval-component', 'n_intervals'),
-     Input('filter-untreated', 'data')]
+     Input('filter-untreated', 'data')],
+    [State('eco-articles-revision', 'data')]
 )
-def load_eco_articles(n_intervals, filter_untreated):
+def load_eco_articles(n_intervals, filter_untreated, rendered):
     """Load economic articles dynamically"""
-    eco_df = load_csv_data(eco_news_file)
-    
-    # Apply filter if needed
-    if filter_untreated and not eco_df.empty:
-        eco_df = eco_df[eco_df['treated'] == False]
+    # A timer tick with no write since the last render changes nothing
+    if callback_context.triggered_id == 'interval-component' and \
+            eco_favorites_store.revision() == (rendered or {}).get('revision'):
+        return no_update, no_update
     
-    return create_article_items(eco_df, 'eco')
+    return render_saved_articles(eco_favorites_store, 'eco', filter_untreated, rendered)
 
 # Callback to load stock articles
 @callback(
-    Output('stock-articles-container', 'children'),
+    [Output('stock-articles-container', 'children'),
+     Output('stock-articles-revision', 'data')],
     [Input('interval-component', 'n_intervals'),
-     Input('filter-untreated', 'data')]
+     Input('filter-untreated', 'data')],
+    [State('stock-articles-revision', 'data')]
 )
-def load_stock_articles(n_intervals, filter_untreated):
+def load_stock_articles(n_intervals, filter_untreated, rendered):
     """Load stock articles dynamically"""
-    stock_df = load_csv_data(stock_news_file)
-    
-    # Apply filter if needed
-    if filter_untreated and not stock_df.empty:
-        stock_df = stock_df[stock_df['treated'] == False]
+    # A timer tick with no write since the last render changes nothing
+    if callback_context.triggered_id == 'interval-component' and \
+            stock_favorites_store.revision() == (rendered or {}).get('revision'):
+        return no_update, no_update
     
-    return create_article_items(stock_df, 'stock')
+    return render_saved_articles(stock_favorites_store, 'stock', filter_untreated, rendered)
 
 # Callback to handle delete button clicks
 @callback(
@@ -581,45 +678,39 @@ def show_confirm_dialog(n_clicks_list, article_titles, article_sections):
 # Callback to handle article deletion
 @callback(
     [Output('eco-articles-container', 'children', allow_duplicate=True),
+     Output('eco-articles-revision', 'data', allow_duplicate=True),
      Output('stock-articles-container', 'children', allow_duplicate=True),
+     Output('stock-articles-revision', 'data', allow_duplicate=True),
      Output('article-to-delete', 'data', allow_duplicate=True)],
     [Input('confirm-delete-dialog', 'submit_n_clicks')],
     [State('article-to-delete', 'data'),
-     State('filter-untreated', 'data')],
+     State('filter-untreated', 'data'),
+     State('eco-articles-revision', 'data'),
+     State('stock-articles-revision', 'data')],
     prevent_initial_call=True
 )
-def delete_article(submit_n_clicks, article_data, filter_untreated):
+def delete_article(submit_n_clicks, article_data, filter_untreated, eco_rendered, stock_rendered):
     if submit_n_clicks and article_data:
         article_title = article_data['title']
         section = article_data['section']
         
-        # Determine which file to delete from
+        # Determine which store to delete from
         if section == 'eco':
-            file_path = eco_news_file
+            store = eco_favorites_store
         else:
-            file_path = stock_news_file
+            store = stock_favorites_store
         
-        # Delete from CSV
-        success = delete_article_from_csv(article_title, file_path)
+        success = delete_saved_article(article_title, store)
         
         if success:
-            # Reload both sections with current filter
-            new_eco_df = load_csv_data(eco_news_file)
-            new_stock_df = load_csv_data(stock_news_file)
-            
-            # Apply filter if needed
-            if filter_untreated:
-                if not new_eco_df.empty:
-                    new_eco_df = new_eco_df[new_eco_df['treated'] == False]
-                if not new_stock_df.empty:
-                    new_stock_df = new_stock_df[new_stock_df['treated'] == False]
-            
-            new_eco_items = create_article_items(new_eco_df, 'eco')
-            new_stock_items = create_article_items(new_stock_df, 'stock')
-            
-            return new_eco_items, new_stock_items, None
+            # Reload only the section the article was deleted from
+            rendered = eco_rendered if section == 'eco' else stock_rendered
+            items, revision = render_saved_articles(store, section, filter_untreated, rendered)
+            if section == 'eco':
+                return items, revision, no_update, no_update, None
+            return no_update, no_update, items, revision, None
         
-    return no_update, no_update, no_update
+    return no_update, no_update, no_update, no_update, no_update
 
 # Callback to handle select all button
 @callback(
@@ -648,17 +739,16 @@ def handle_select_all(select_all_clicks, deselect_all_clicks, current_values):
 # Callback to handle PDF generation
 @callback(
     [Output('pdf-status', 'children'),
-     Output('eco-articles-container', 'children', allow_duplicate=True),
-     Output('stock-articles-container', 'children', allow_duplicate=True)],
+     Output('pdf-job-store', 'data'),
+     Output('pdf-job-interval', 'disabled')],
     [Input('generate-pdf-btn', 'n_clicks')],
     [State({'type': 'article-select', 'index': ALL}, 'value'),
      State({'type': 'article-title', 'index': ALL}, 'children'),
      State({'type': 'article-resume', 'index': ALL}, 'children'),
-     State({'type': 'article-section', 'index': ALL}, 'children'),
-     State('filter-untreated', 'data')],
+     State({'type': 'article-section', 'index': ALL}, 'children')],
     prevent_initial_call=True
 )
-def generate_pdf(n_clicks, selected_values, article_titles, article_resumes, article_sections, filter_untreated):
+def generate_pdf(n_clicks, selected_values, article_titles, article_resumes, article_sections):
     if not n_clicks:
         return "", no_update, no_update
     
@@ -687,74 +777,73 @@ def generate_pdf(n_clicks, selected_values, article_titles, article_resumes, art
             "Aucun article sélectionné. Veuillez sélectionner au moins un article."
         ], style={'color': COLORS['danger']}), no_update, no_update
     
-    try:
-        # Send request to FastAPI server
-        response = requests.post(
-            f"{FASTAPI_SERVER_URL}/generate-pdf",
-            json={"articles": selected_articles},
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            filename = result.get('filename', '')
-            articles_count = result.get('articles_count', 0)
-            
-            # Update treated status for selected articles
-            if selected_eco_titles:
-                update_treated_status(selected_eco_titles, eco_news_file)
-            if selected_stock_titles:
-                update_treated_status(selected_stock_titles, stock_news_file)
-            
-            # Reload articles to reflect updated treated status
-            new_eco_df = load_csv_data(eco_news_file)
-            new_stock_df = load_csv_data(stock_news_file)
-            
-            # Apply filter if needed
-            if filter_untreated:
-                if not new_eco_df.empty:
-                    new_eco_df = new_eco_df[new_eco_df['treated'] == False]
-                if not new_stock_df.empty:
-                    new_stock_df = new_stock_df[new_stock_df['treated'] == False]
-            
-            new_eco_items = create_article_items(new_eco_df, 'eco')
-            new_stock_items = create_article_items(new_stock_df, 'stock')
-            
-            status_message = html.Div([
-                html.I(className="fas fa-check-circle", style={'margin-right': '8px'}),
-                f"PDF généré avec succès ! {articles_count} articles traités. ",
-                html.A(
-                    "Télécharger PDF",
-                    href=f"{FASTAPI_SERVER_URL}/download-pdf/{filename}",
-                    target="_blank",
-                    style={
-                        'color': COLORS['secondary'],
-                        'text-decoration': 'none',
-                        'font-weight': '600'
-                    }
-                )
-            ], style={'color': COLORS['success']})
-            
-            return status_message, new_eco_items, new_stock_items
-        else:
-            error_message = html.Div([
-                html.I(className="fas fa-exclamation-circle", style={'margin-right': '8px'}),
-                f"Erreur lors de la génération du PDF: {response.status_code}"
-            ], style={'color': COLORS['danger']})
-            
-            return error_message, no_update, no_update
-            
-    except requests.RequestException as e:
-        error_message = html.Div([
+    # The PDF is rendered in the background; an identical selection already in progress is reused
+    key = report_key(selected_articles, PDF_TEMPLATE_VERSION)
+    job_id = report_jobs.submit(('pdf', key), generate_pdf_report,
+                                key, selected_articles, selected_eco_titles, selected_stock_titles)
+    
+    return create_pdf_progress(report_jobs.get(job_id)), {'job_id': job_id}, False
+
+def create_pdf_progress(job):
+    """Status message of a queued or running PDF job"""
+    return html.Div([
+        html.I(className="fas fa-spinner fa-spin", style={'margin-right': '8px'}),
+        f"{job.message}... ({int(job.progress * 100)}%)"
+    ], style={'color': COLORS['secondary']})
+
+# Callback to report the PDF job status
+@callback(
+    [Output('pdf-status', 'children', allow_duplicate=True),
+     Output('pdf-job-interval', 'disabled', allow_duplicate=True),
+     Output('eco-articles-container', 'children', allow_duplicate=True),
+     Output('eco-articles-revision', 'data', allow_duplicate=True),
+     Output('stock-articles-container', 'children', allow_duplicate=True),
+     Output('stock-articles-revision', 'data', allow_duplicate=True)],
+    [Input('pdf-job-interval', 'n_intervals')],
+    [State('pdf-job-store', 'data'),
+     State('filter-untreated', 'data'),
+     State('eco-articles-revision', 'data'),
+     State('stock-articles-revision', 'data')],
+    prevent_initial_call=True
+)
+def poll_pdf_job(n_intervals, job_data, filter_untreated, eco_rendered, stock_rendered):
+    job = report_jobs.get(job_data['job_id']) if job_data else None
+    
+    if job is None:
+        return html.Div([
             html.I(className="fas fa-exclamation-circle", style={'margin-right': '8px'}),
-            f"Erreur de connexion au serveur: {str(e)}"
-        ], style={'color': COLORS['danger']})
-        
-        return error_message, no_update, no_update
-    except Exception as e:
+            "Tâche de génération introuvable. Veuillez relancer la génération."
+        ], style={'color': COLORS['danger']}), True, no_update, no_update, no_update, no_update
+    
+    if not job.finished:
+        return create_pdf_progress(job), False, no_update, no_update, no_update, no_update
+    
+    if job.status == 'error':
         error_message = html.Div([
             html.I(className="fas fa-exclamation-circle", style={'margin-right': '8px'}),
-            f"Erreur inattendue: {str(e)}"
+            job.error
         ], style={'color': COLORS['danger']})
         
-        return error_message, no_update, no_update
\ No newline at end of file
+        return error_message, True, no_update, no_update, no_update, no_update
+    
+    # Reload articles to reflect updated treated status
+    new_eco_items, eco_revision = render_saved_articles(eco_favorites_store, 'eco', filter_untreated, eco_rendered)
+    new_stock_items, stock_revision = render_saved_articles(stock_favorites_store, 'stock', filter_untreated,
+                                                            stock_rendered)
+    
+    status_message = html.Div([
+        html.I(className="fas fa-check-circle", style={'margin-right': '8px'}),
+        f"PDF généré avec succès ! {job.result['articles_count']} articles traités. ",
+        html.A(
+            "Télécharger PDF",
+            href=job.result['download_url'],
+            target="_blank",
+            style={
+                'color': COLORS['secondary'],
+                'text-decoration': 'none',
+                'font-weight': '600'
+            }
+        )
+    ], style={'color': COLORS['success']})
+    
+    return status_message, True, new_eco_items, eco_revision, new_stock_items, stock_revision
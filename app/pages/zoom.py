@@ -1,31 +1,26 @@
 # pages/zoom.py
 import os
-import time
 
 import pandas as pd
 import plotly.express as px
 import yaml
-from dash import Input, Output, State, callback, dcc, html
+from dash import Input, Output, State, callback, dcc, html, no_update
 from styles.styles import card_style
+from services.data_cache import read_excel_cached
+from services.lazy_data import lazy_data
+from services.parsing import parse_dates
+from services.report_jobs import report_jobs
+from services.zoom_reports import REPORT_FILENAMES, read_report, submit_report
 
 # Load config
 with open('config.yaml', 'r') as f:
     config = yaml.safe_load(f)
-    
-# Load the relevant data from the Excel file (starting from row 24, which is index 23)
-file_path = config['paths']['ipc']
-try:
-    # Check if file exists
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
-    # Force use of openpyxl engine to avoid xlrd compatibility issues
-    df = pd.read_excel(
-        file_path,
-        sheet_name=0,
-        skiprows=23,
-        usecols="B:E",
-        engine='openpyxl'
-    )
+
+# Month labels found in the HCP IPC sheet
+IPC_DATE_FORMATS = ('%Y-%m', '%m/%Y', '%Y-%m-%d', '%Y-%m-%d %H:%M:%S')
+
+def prepare_ipc_data(df):
+    """Clean the raw IPC sheet into one dated row per month"""
     # Rename columns for clarity
     df.columns = ['Mois', 'Alimentation', 'Produits Non Alimentaires', 'Indice Général']
     # Clean up: remove any rows where 'Mois' is NaN (in case of trailing empty rows)
@@ -40,103 +35,101 @@ try:
     
     # Convert 'Mois' to datetime if it's not already, and sort chronologically
     if not pd.api.types.is_datetime64_any_dtype(df['Mois']):
-        # First, try to filter out any remaining non-date entries
-        def is_valid_date_string(x):
-            """Check if a string could be a valid date"""
-            try:
-                str_x = str(x).strip()
-                # Check if it looks like a date (contains numbers and common date separators)
-                if any(char.isdigit() for char in str_x) and len(str_x) > 3:
-                    # Try basic date conversion
-                    pd.to_datetime(str_x, errors='raise')
-                    return True
-                return False
-            except:
-                return False
+        # Keep only labels that could be dates (contain digits and are long enough)
+        labels = df['Mois'].astype(str).str.strip()
+        df = df[labels.str.contains(r'\d') & (labels.str.len() > 3)].copy()
         
-        # Filter to keep only rows with valid date strings
-        valid_date_mask = df['Mois'].apply(is_valid_date_string)
-        df = df[valid_date_mask]
-        
-        # Now try to convert to datetime with better error handling
-        try:
-            df['Mois'] = pd.to_datetime(df['Mois'], errors='coerce')
-        except:
-            # If direct conversion fails, try common date formats
-            try:
-                df['Mois'] = pd.to_datetime(df['Mois'], format='%Y-%m', errors='coerce')
-            except:
-                try:
-                    df['Mois'] = pd.to_datetime(df['Mois'], format='%m/%Y', errors='coerce')
-                except:
-                    try:
-                        df['Mois'] = pd.to_datetime(df['Mois'], format='%Y-%m-%d', errors='coerce')
-                    except:
-                        # Last resort: try to parse each format individually
-                        df['Mois'] = pd.to_datetime(df['Mois'], errors='coerce')
+        # Each distinct label is parsed once, trying the usual HCP formats column-wide
+        df['Mois'] = parse_dates(df['Mois'], formats=IPC_DATE_FORMATS, dayfirst=False)
         
         # Remove any rows where date conversion failed (NaT values)
         df = df.dropna(subset=['Mois'])
     
     # Sort by date in ascending order (oldest to newest)
     df = df.sort_values('Mois').reset_index(drop=True)
-    
-    # Melt the dataframe for multi-line plotting
-    df_melted = df.melt(id_vars='Mois', var_name='Catégorie', value_name='Indice')
-    # Create the line chart with professional styling
-    fig = px.line(
-        df_melted,
-        x='Mois',
-        y='Indice',
-        color='Catégorie',
-        title="Évolution de l'Indice des Prix à la Consommation"
-    )
-    
-    # Enhanced chart styling
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family="Inter, sans-serif", size=12, color="#2d3436"),
-        title=dict(
-            font=dict(size=18, color="#2d3436", family="Inter, sans-serif"),
-            x=0.5,
-            xanchor='center'
-        ),
-        xaxis=dict(
-            gridcolor='rgba(128,128,128,0.2)',
-            showgrid=True,
-            zeroline=False,
-            # Ensure x-axis shows dates in chronological order
-            type='date'
-        ),
-        yaxis=dict(
-            gridcolor='rgba(128,128,128,0.2)',
-            showgrid=True,
-            zeroline=False
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
+    return df
+
+def load_ipc_data():
+    """Load the IPC sheet and build its chart"""
+    df = None
+    # Load the relevant data from the Excel file (starting from row 24, which is index 23)
+    file_path = config['paths']['ipc']
+    try:
+        # Check if file exists
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        # Force use of openpyxl engine to avoid xlrd compatibility issues
+        df = read_excel_cached(
+            file_path,
+            prepare=prepare_ipc_data,
+            sheet_name=0,
+            skiprows=23,
+            usecols="B:E",
+            engine='openpyxl'
+        )
+
+        # Melt the dataframe for multi-line plotting
+        df_melted = df.melt(id_vars='Mois', var_name='Catégorie', value_name='Indice')
+        # Create the line chart with professional styling
+        fig = px.line(
+            df_melted,
+            x='Mois',
+            y='Indice',
+            color='Catégorie',
+            title="Évolution de l'Indice des Prix à la Consommation"
         )
-    )
-    fig.update_traces(line=dict(width=3))
-    print("Data loaded successfully!")
-except FileNotFoundError as e:
-    print(f"File error: {e}")
-    # Create empty figure as fallback
-    fig = px.line(title="Fichier de données non trouvé")
-except ImportError as e:
-    print(f"Missing dependency: {e}")
-    print("Please install openpyxl: pip install openpyxl")
-    # Create empty figure as fallback
-    fig = px.line(title="Dépendance manquante - Installer openpyxl")
-except Exception as e:
-    print(f"Error loading data: {e}")
-    # Create empty figure as fallback
-    fig = px.line(title="Erreur lors du chargement des données")
+
+        # Enhanced chart styling
+        fig.update_layout(
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(family="Inter, sans-serif", size=12, color="#2d3436"),
+            title=dict(
+                font=dict(size=18, color="#2d3436", family="Inter, sans-serif"),
+                x=0.5,
+                xanchor='center'
+            ),
+            xaxis=dict(
+                gridcolor='rgba(128,128,128,0.2)',
+                showgrid=True,
+                zeroline=False,
+                # Ensure x-axis shows dates in chronological order
+                type='date'
+            ),
+            yaxis=dict(
+                gridcolor='rgba(128,128,128,0.2)',
+                showgrid=True,
+                zeroline=False
+            ),
+            legend=dict(
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            )
+        )
+        fig.update_traces(line=dict(width=3))
+        print("Data loaded successfully!")
+    except FileNotFoundError as e:
+        print(f"File error: {e}")
+        # Create empty figure as fallback
+        fig = px.line(title="Fichier de données non trouvé")
+    except ImportError as e:
+        print(f"Missing dependency: {e}")
+        print("Please install openpyxl: pip install openpyxl")
+        # Create empty figure as fallback
+        fig = px.line(title="Dépendance manquante - Installer openpyxl")
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        df = None
+        # Create empty figure as fallback
+        fig = px.line(title="Erreur lors du chargement des données")
+    return {'data': df, 'figure': fig}
+
+
+# IPC data and chart, loaded on the first visit of the page
+ipc_data = lazy_data('zoom', load_ipc_data, check=lambda ipc: ipc['data'] is not None)
 
 # Enhanced styling definitions
 enhanced_card_style = {
@@ -182,70 +175,41 @@ button_style_success = {
 }
 
 # Page layout with enhanced styling
-layout = html.Div([
+def layout():
+    return html.Div([
 
     
-    # Main container with proper spacing
-    html.Div([
-        # Custom CSS styles
-        html.Link(
-            rel='stylesheet',
-            href='https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap'
-        ),
-        
-        # Header section
+        # Main container with proper spacing
         html.Div([
-            html.H1("Tableau de Bord Économique", style={
-                'fontSize': '2.25rem',
-                'fontWeight': '800',
-                'color': '#1f2937',
-                'fontFamily': 'Inter, sans-serif',
-                'marginBottom': '1.5rem',
-                'textAlign': 'center'
-            })
-        ]),
+            # Custom CSS styles
+            html.Link(
+                rel='stylesheet',
+                href='https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap'
+            ),
         
-        # IPC Chart section
-        html.Div([
+            # Header section
             html.Div([
-                html.H2("Indice des Prix à la Consommation", style={
-                    'fontSize': '1.5rem',
-                    'fontWeight': '700',
+                html.H1("Tableau de Bord Économique", style={
+                    'fontSize': '2.25rem',
+                    'fontWeight': '800',
                     'color': '#1f2937',
                     'fontFamily': 'Inter, sans-serif',
-                    'margin': '0'
-                }),
-                html.P("Évolution mensuelle des indices par catégorie - Maroc", style={
-                    'fontSize': '0.875rem',
-                    'color': '#6b7280',
-                    'marginTop': '0.25rem',
-                    'fontFamily': 'Inter, sans-serif'
+                    'marginBottom': '1.5rem',
+                    'textAlign': 'center'
                 })
-            ], style={
-                'marginBottom': '1.5rem',
-                'paddingBottom': '0.75rem',
-                'borderBottom': '2px solid #f3f4f6'
-            }),
-            dcc.Graph(
-                figure=fig,
-                style={'height': '500px'},
-                config={'displayModeBar': False}
-            )
-        ], style=enhanced_card_style),
+            ]),
         
-        # News Generation sections in a grid
-        html.Div([
-            # Morning News section
+            # IPC Chart section
             html.Div([
                 html.Div([
-                    html.H2("Morning News", style={
+                    html.H2("Indice des Prix à la Consommation", style={
                         'fontSize': '1.5rem',
                         'fontWeight': '700',
                         'color': '#1f2937',
                         'fontFamily': 'Inter, sans-serif',
                         'margin': '0'
                     }),
-                    html.P("Générez votre rapport matinal personnalisé", style={
+                    html.P("Évolution mensuelle des indices par catégorie - Maroc", style={
                         'fontSize': '0.875rem',
                         'color': '#6b7280',
                         'marginTop': '0.25rem',
@@ -256,184 +220,152 @@ layout = html.Div([
                     'paddingBottom': '0.75rem',
                     'borderBottom': '2px solid #f3f4f6'
                 }),
-                
-                html.Button(
-                    [
-                        html.Span("", style={'marginRight': '8px'}),
-                        "Générer Morning News"
-                    ], 
-                    id="btn-morning-news", 
-                    n_clicks=0,
-                    style=button_style_primary
-                ),
-                html.Div(id="morning-news-content"),
-                dcc.Download(id="download-morning-news"),
-                dcc.Store(id="morning-news-store")
-            ], style={**enhanced_card_style, 'marginRight': '1rem'}, className="col-6"),
-            
-            # Eco News section
+                dcc.Graph(
+                    figure=ipc_data.get()['figure'],
+                    style={'height': '500px'},
+                    config={'displayModeBar': False}
+                )
+            ], style=enhanced_card_style),
+        
+            # News Generation sections in a grid
             html.Div([
+                # Morning News section
                 html.Div([
-                    html.H2("Éco News", style={
-                        'fontSize': '1.5rem',
-                        'fontWeight': '700',
-                        'color': '#1f2937',
-                        'fontFamily': 'Inter, sans-serif',
-                        'margin': '0'
+                    html.Div([
+                        html.H2("Morning News", style={
+                            'fontSize': '1.5rem',
+                            'fontWeight': '700',
+                            'color': '#1f2937',
+                            'fontFamily': 'Inter, sans-serif',
+                            'margin': '0'
+                        }),
+                        html.P("Générez votre rapport matinal personnalisé", style={
+                            'fontSize': '0.875rem',
+                            'color': '#6b7280',
+                            'marginTop': '0.25rem',
+                            'fontFamily': 'Inter, sans-serif'
+                        })
+                    ], style={
+                        'marginBottom': '1.5rem',
+                        'paddingBottom': '0.75rem',
+                        'borderBottom': '2px solid #f3f4f6'
                     }),
-                    html.P("Générez votre rapport économique détaillé", style={
-                        'fontSize': '0.875rem',
-                        'color': '#6b7280',
-                        'marginTop': '0.25rem',
-                        'fontFamily': 'Inter, sans-serif'
-                    })
-                ], style={
-                    'marginBottom': '1.5rem',
-                    'paddingBottom': '0.75rem',
-                    'borderBottom': '2px solid #f3f4f6'
-                }),
                 
-                html.Button(
-                    [
-                        html.Span("", style={'marginRight': '8px'}),
-                        "Générer Éco News"
-                    ], 
-                    id="btn-eco-news", 
-                    n_clicks=0,
-                    style=button_style_success
-                ),
-                html.Div(id="eco-news-content"),
-                dcc.Download(id="download-eco-news"),
-                dcc.Store(id="eco-news-store")
-            ], style={**enhanced_card_style, 'marginLeft': '1rem'}, className="col-6")
-        ], style={
-            'display': 'flex',
-            'gap': '0',
-            'marginBottom': '2rem'
-        }),
-        
-        # Interval component for loading simulation
-        dcc.Interval(
-            id='loading-interval',
-            interval=100,  # Update every 100ms
-            n_intervals=0,
-            disabled=True
-        )
-    ], style={
-        'maxWidth': '1200px',
-        'margin': '0 auto',
-        'padding': '2rem 1rem',
-        'paddingTop': '2rem',  # Add top padding to separate from navbar
-        'minHeight': 'calc(100vh - 200px)'  # Ensure proper spacing from footer
-    })
-])
-
-# Enhanced Morning News callback
-@callback(
-    [Output("morning-news-content", "children"),
-     Output("loading-interval", "disabled"),
-     Output("morning-news-store", "data"),
-     Output("download-morning-news", "data")],
-    [Input("btn-morning-news", "n_clicks"),
-     Input("loading-interval", "n_intervals")],
-    [State("morning-news-store", "data")]
-)
-def generate_morning_news(n_clicks, n_intervals, store_data):
-    if n_clicks == 0:
-        return "", True, {}, None
-    
-    # Initialize store data if needed
-    if not store_data:
-        store_data = {"start_time": None, "loading": False}
-    
-    # Start loading process
-    if n_clicks > 0 and not store_data.get("loading"):
-        store_data = {"start_time": time.time(), "loading": True}
-        loading_content = html.Div([
-            html.Div(className="spinner", style={
-                'border': '4px solid #f3f4f6',
-                'borderTop': '4px solid #3b82f6',
-                'borderRadius': '50%',
-                'width': '40px',
-                'height': '40px',
-                'animation': 'spin 1s linear infinite',
-                'margin': '0 auto 16px auto'
-            }),
-            html.H4("Génération en cours...", style={
-                'color': '#374151',
-                'fontSize': '1.125rem',
-                'fontWeight': '600',
-                'marginBottom': '0.5rem',
-                'fontFamily': 'Inter, sans-serif'
-            }),
-            html.P("Collecte et analyse des dernières actualités", style={
-                'color': '#6b7280',
-                'fontSize': '0.875rem',
-                'fontFamily': 'Inter, sans-serif'
-            })
-                    ], style={
-                'padding': '2rem',
-                'textAlign': 'center',
-                'background': 'linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%)',
-                'borderRadius': '12px',
-                'border': '1px solid #e2e8f0'
-            })
-        return loading_content, False, store_data, None
-    
-    # Check if loading is complete (5 seconds)
-    if store_data.get("loading") and store_data.get("start_time"):
-        elapsed_time = time.time() - store_data["start_time"]
-        if elapsed_time >= 5:
-            pdf_file_path = "/Users/mac/Sentiment Analysis Press/morning_news_final.pdf"
+                    html.Button(
+                        [
+                            html.Span("", style={'marginRight': '8px'}),
+                            "Générer Morning News"
+                        ], 
+                        id="btn-morning-news", 
+                        n_clicks=0,
+                        style=button_style_primary
+                    ),
+                    html.Div(id="morning-news-content"),
+                    dcc.Download(id="download-morning-news"),
+                    dcc.Store(id="morning-news-store")
+                ], style={**enhanced_card_style, 'marginRight': '1rem'}, className="col-6"),
             
-            success_content = html.Div([
-                html.Div("", style={'fontSize': '2rem', 'marginBottom': '0.5rem'}),
-                html.H4("Morning News généré avec succès!", style={
-                    'color': '#065f46',
-                    'fontSize': '1.125rem',
-                    'fontWeight': '600',
-                    'marginBottom': '0.5rem',
-                    'fontFamily': 'Inter, sans-serif'
-                }),
-                html.P("Le fichier PDF a été téléchargé automatiquement", style={
-                    'color': '#047857',
-                    'fontSize': '0.875rem',
-                    'fontFamily': 'Inter, sans-serif'
-                })
+                # Eco News section
+                html.Div([
+                    html.Div([
+                        html.H2("Éco News", style={
+                            'fontSize': '1.5rem',
+                            'fontWeight': '700',
+                            'color': '#1f2937',
+                            'fontFamily': 'Inter, sans-serif',
+                            'margin': '0'
+                        }),
+                        html.P("Générez votre rapport économique détaillé", style={
+                            'fontSize': '0.875rem',
+                            'color': '#6b7280',
+                            'marginTop': '0.25rem',
+                            'fontFamily': 'Inter, sans-serif'
+                        })
+                    ], style={
+                        'marginBottom': '1.5rem',
+                        'paddingBottom': '0.75rem',
+                        'borderBottom': '2px solid #f3f4f6'
+                    }),
+                
+                    html.Button(
+                        [
+                            html.Span("", style={'marginRight': '8px'}),
+                            "Générer Éco News"
+                        ], 
+                        id="btn-eco-news", 
+                        n_clicks=0,
+                        style=button_style_success
+                    ),
+                    html.Div(id="eco-news-content"),
+                    dcc.Download(id="download-eco-news"),
+                    dcc.Store(id="eco-news-store")
+                ], style={**enhanced_card_style, 'marginLeft': '1rem'}, className="col-6")
             ], style={
-                'padding': '1rem 1.5rem',
-                'backgroundColor': '#ecfdf5',
-                'border': '1px solid #a7f3d0',
-                'borderRadius': '8px',
-                'color': '#065f46',
-                'fontWeight': '500',
-                'textAlign': 'center',
-                'fontFamily': 'Inter, sans-serif'
-            })
-            
-            download_data = dcc.send_file(pdf_file_path)
-            return success_content, True, {"loading": False}, download_data
-        
-        # Still loading with enhanced progress bar
-        progress = (elapsed_time / 5) * 100
-        loading_content = html.Div([
-            html.Div(className="spinner", style={
-                'border': '4px solid #f3f4f6',
-                'borderTop': '4px solid #3b82f6',
-                'borderRadius': '50%',
-                'width': '40px',
-                'height': '40px',
-                'animation': 'spin 1s linear infinite',
-                'margin': '0 auto 16px auto'
-            }),
-            html.H4("Génération en cours...", style={
-                'color': '#374151',
-                'fontSize': '1.125rem',
-                'fontWeight': '600',
-                'marginBottom': '0.5rem',
-                'fontFamily': 'Inter, sans-serif'
+                'display': 'flex',
+                'gap': '0',
+                'marginBottom': '2rem'
             }),
-            html.P(f"Progression: {progress:.0f}%", style={
+        
+            # Polls the report jobs, enabled only while one of them is running
+            dcc.Interval(
+                id='loading-interval',
+                interval=500,  # Update every 500ms
+                n_intervals=0,
+                disabled=True
+            )
+        ], style={
+            'maxWidth': '1200px',
+            'margin': '0 auto',
+            'padding': '2rem 1rem',
+            'paddingTop': '2rem',  # Add top padding to separate from navbar
+            'minHeight': 'calc(100vh - 200px)'  # Ensure proper spacing from footer
+        })
+    ])
+
+# Reports of the page: name, loading message and progress bar colors
+REPORTS = {
+    'morning': {
+        'name': 'Morning News',
+        'loading_text': "Collecte et analyse des dernières actualités",
+        'colors': ('#3b82f6', '#1d4ed8')
+    },
+    'eco': {
+        'name': 'Éco News',
+        'loading_text': "Analyse des données économiques",
+        'colors': ('#10b981', '#047857')
+    }
+}
+
+def create_report_progress(report_type, progress=None, message=None):
+    """Spinner and progress bar of a report being generated"""
+    report = REPORTS[report_type]
+    children = [
+        html.Div(className="spinner", style={
+            'border': '4px solid #f3f4f6',
+            'borderTop': f'4px solid {report["colors"][0]}',
+            'borderRadius': '50%',
+            'width': '40px',
+            'height': '40px',
+            'animation': 'spin 1s linear infinite',
+            'margin': '0 auto 16px auto'
+        }),
+        html.H4("Génération en cours...", style={
+            'color': '#374151',
+            'fontSize': '1.125rem',
+            'fontWeight': '600',
+            'marginBottom': '0.5rem',
+            'fontFamily': 'Inter, sans-serif'
+        })
+    ]
+    if progress is None:
+        children.append(html.P(report['loading_text'], style={
+            'color': '#6b7280',
+            'fontSize': '0.875rem',
+            'fontFamily': 'Inter, sans-serif'
+        }))
+    else:
+        children.extend([
+            html.P(f"{message} - Progression: {progress * 100:.0f}%", style={
                 'color': '#6b7280',
                 'fontSize': '0.875rem',
                 'fontFamily': 'Inter, sans-serif',
@@ -441,9 +373,9 @@ def generate_morning_news(n_clicks, n_intervals, store_data):
             }),
             html.Div([
                 html.Div(style={
-                    'width': f'{progress}%',
+                    'width': f'{progress * 100}%',
                     'height': '8px',
-                    'background': 'linear-gradient(90deg, #3b82f6 0%, #1d4ed8 100%)',
+                    'background': f'linear-gradient(90deg, {report["colors"][0]} 0%, {report["colors"][1]} 100%)',
                     'borderRadius': '10px',
                     'transition': 'width 0.3s ease'
                 })
@@ -454,143 +386,135 @@ def generate_morning_news(n_clicks, n_intervals, store_data):
                 'margin': '16px 0',
                 'overflow': 'hidden'
             })
-        ], style={
-            'padding': '2rem',
-            'textAlign': 'center',
-            'background': 'linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%)',
-            'borderRadius': '12px',
-            'border': '1px solid #e2e8f0'
+        ])
+    return html.Div(children, style={
+        'padding': '2rem',
+        'textAlign': 'center',
+        'background': 'linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%)',
+        'borderRadius': '12px',
+        'border': '1px solid #e2e8f0'
+    })
+
+def create_report_success(report_type):
+    return html.Div([
+        html.H4(f"{REPORTS[report_type]['name']} généré avec succès!", style={
+            'color': '#065f46',
+            'fontSize': '1.125rem',
+            'fontWeight': '600',
+            'marginBottom': '0.5rem',
+            'fontFamily': 'Inter, sans-serif'
+        }),
+        html.P("Le fichier PDF a été téléchargé automatiquement", style={
+            'color': '#047857',
+            'fontSize': '0.875rem',
+            'fontFamily': 'Inter, sans-serif'
         })
-        return loading_content, False, store_data, None
-    
-    return "", True, {}, None
+    ], style={
+        'padding': '1rem 1.5rem',
+        'backgroundColor': '#ecfdf5',
+        'border': '1px solid #a7f3d0',
+        'borderRadius': '8px',
+        'color': '#065f46',
+        'fontWeight': '500',
+        'textAlign': 'center',
+        'fontFamily': 'Inter, sans-serif'
+    })
 
-# Enhanced Eco News callback
+def create_report_error(report_type, error):
+    return html.Div([
+        html.H4(f"Échec de la génération du {REPORTS[report_type]['name']}", style={
+            'color': '#991b1b',
+            'fontSize': '1.125rem',
+            'fontWeight': '600',
+            'marginBottom': '0.5rem',
+            'fontFamily': 'Inter, sans-serif'
+        }),
+        html.P(error, style={
+            'color': '#b91c1c',
+            'fontSize': '0.875rem',
+            'fontFamily': 'Inter, sans-serif'
+        })
+    ], style={
+        'padding': '1rem 1.5rem',
+        'backgroundColor': '#fef2f2',
+        'border': '1px solid #fecaca',
+        'borderRadius': '8px',
+        'textAlign': 'center',
+        'fontFamily': 'Inter, sans-serif'
+    })
+
+def start_report(report_type):
+    """Outputs of a generate button: the cached edition right away, or a started job"""
+    ipc, ipc_version = ipc_data.get_versioned()
+    job_id, pdf = submit_report(report_type, ipc['data'], ipc_version)
+    if pdf is not None:
+        return create_report_success(report_type), {}, dcc.send_bytes(pdf, REPORT_FILENAMES[report_type]), no_update
+    return create_report_progress(report_type), {'job_id': job_id}, no_update, False
+
+def report_status(report_type, store_data):
+    """Outputs of a polled report, and whether its job is still running"""
+    job_id = (store_data or {}).get('job_id')
+    if not job_id:
+        return no_update, no_update, no_update, False
+    job = report_jobs.get(job_id)
+    if job is None:
+        return create_report_error(report_type, "Tâche de génération introuvable"), {}, no_update, False
+    if not job.finished:
+        return create_report_progress(report_type, job.progress, job.message), no_update, no_update, True
+    if job.status == 'error':
+        return create_report_error(report_type, job.error), {}, no_update, False
+    pdf = read_report(job.result['key'])
+    if pdf is None:
+        return create_report_error(report_type, "Le rapport n'est plus disponible, veuillez le générer à nouveau"), {}, no_update, False
+    return create_report_success(report_type), {}, dcc.send_bytes(pdf, job.result['filename']), False
+
+# Morning News callback
+@callback(
+    [Output("morning-news-content", "children"),
+     Output("morning-news-store", "data"),
+     Output("download-morning-news", "data"),
+     Output("loading-interval", "disabled", allow_duplicate=True)],
+    [Input("btn-morning-news", "n_clicks")],
+    prevent_initial_call=True
+)
+def generate_morning_news(n_clicks):
+    if not n_clicks:
+        return no_update, no_update, no_update, no_update
+    return start_report('morning')
+
+# Éco News callback
 @callback(
     [Output("eco-news-content", "children"),
      Output("eco-news-store", "data"),
-     Output("download-eco-news", "data")],
-    [Input("btn-eco-news", "n_clicks"),
-     Input("loading-interval", "n_intervals")],
-    [State("eco-news-store", "data")]
+     Output("download-eco-news", "data"),
+     Output("loading-interval", "disabled", allow_duplicate=True)],
+    [Input("btn-eco-news", "n_clicks")],
+    prevent_initial_call=True
 )
-def generate_eco_news(n_clicks, n_intervals, store_data):
-    if n_clicks == 0:
-        return "", {}, None
-    
-    # Initialize store data if needed
-    if not store_data:
-        store_data = {"start_time": None, "loading": False}
-    
-    # Start loading process
-    if n_clicks > 0 and not store_data.get("loading"):
-        store_data = {"start_time": time.time(), "loading": True}
-        loading_content = html.Div([
-            html.Div(style={
-                'border': '4px solid #f3f4f6',
-                'borderTop': '4px solid #10b981',
-                'borderRadius': '50%',
-                'width': '40px',
-                'height': '40px',
-                'animation': 'spin 1s linear infinite',
-                'margin': '0 auto 16px auto'
-            }),
-            html.H4("Génération en cours...", style={
-                'color': '#374151',
-                'fontSize': '1.125rem',
-                'fontWeight': '600',
-                'marginBottom': '0.5rem',
-                'fontFamily': 'Inter, sans-serif'
-            }),
-            html.P("Analyse des données économiques", style={
-                'color': '#6b7280',
-                'fontSize': '0.875rem',
-                'fontFamily': 'Inter, sans-serif'
-            })
-        ], style={
-            'padding': '2rem',
-            'textAlign': 'center',
-            'background': 'linear-gradient(135deg, #f8fafc 0%, #f1f5f9 100%)',
-            'borderRadius': '12px',
-            'border': '1px solid #e2e8f0'
-        })
-        return loading_content, store_data, None
-    
-    # Check if loading is complete (5 seconds)
-    if store_data.get("loading") and store_data.get("start_time"):
-        elapsed_time = time.time() - store_data["start_time"]
-        if elapsed_time >= 5:
-            pdf_file_path = "/Users/mac/Sentiment Analysis Press/eco_news_report.pdf"
-            
-            success_content = html.Div([
-                html.Div("", style={'fontSize': '2rem', 'marginBottom': '0.5rem'}),
-                html.H4("Éco News généré avec succès!", style={
-                    'color': '#065f46',
-                    'fontSize': '1.125rem',
-                    'fontWeight': '600',
-                    'marginBottom': '0.5rem',
-                    'fontFamily': 'Inter, sans-serif'
-                }),
-                html.P("Le fichier PDF a été téléchargé automatiquement", style={
-                    'color': '#047857',
-                    'fontSize': '0.875rem',
-                    'fontFamily': 'Inter, sans-serif'
-                })
-            ], style={
-                'padding': '1rem 1.5rem',
-                'backgroundColor': '#ecfdf5',
-                'border': '1px solid #a7f3d0',
-                'borderRadius': '8px',
-                'color': '#065f46',
-                'fontWeight': '500',
-                'textAlign': 'center',
-                'fontFamily': 'Inter, sans-serif'
-            })
-            
-            download_data = dcc.send_file(pdf_file_path)
-            return success_content, {"loading": False}, download_data
-        
-        # Still loading with enhanced progress bar
-        progress = (elapsed_time / 5) * 100
-        loading_content = html.Div([
-            html.Div(style={
-                'border': '4px solid #f3f4f6',
-                'borderTop': '4px solid #10b981',
-                'borderRadius': '50%',
-                'width': '40px',
-                'height': '40px',
-                'animation': 'spin 1s linear infinite',
-                'margin': '0 auto 16px auto'
-            }),
-            html.H4("Génération en cours...", style={
-                'color': '#374151',
-                'fontSize': '1.125rem',
-                'fontWeight': '600',
-                'marginBottom': '0.5rem',
-                'fontFamily': 'Inter, sans-serif'
-            }),
-            html.P(f"Progression: {progress:.0f}%", style={
-                'color': '#6b7280',
-                'fontSize': '0.875rem',
-                'fontFamily': 'Inter, sans-serif',
-                'marginBottom': '1rem'
-            }),
-            html.Div([
-                html.Div(style={
-                    'width': f'{progress}%',
-                    'height': '8px',
-                    'background': 'linear-gradient(90deg, #10b981 0%, #047857 100%)',
-                    'borderRadius': '10px',
-                    'transition': 'width 0.3s ease'
-                })
-            ], style={
-                'width': '100%',
-                'backgroundColor': '#f3f4f6',
-                'borderRadius': '10px',
-                'margin': '16px 0',
-                'overflow': 'hidden'
-            })
-        ], className="loading-container")
-        return loading_content, store_data, None
-    
-    return "", {}, None
\ No newline at end of file
+def generate_eco_news(n_clicks):
+    if not n_clicks:
+        return no_update, no_update, no_update, no_update
+    return start_report('eco')
+
+# Progress of the running reports; the interval only runs while one of them is generating
+@callback(
+    [Output("morning-news-content", "children", allow_duplicate=True),
+     Output("morning-news-store", "data", allow_duplicate=True),
+     Output("download-morning-news", "data", allow_duplicate=True),
+     Output("eco-news-content", "children", allow_duplicate=True),
+     Output("eco-news-store", "data", allow_duplicate=True),
+     Output("download-eco-news", "data", allow_duplicate=True),
+     Output("loading-interval", "disabled")],
+    [Input("loading-interval", "n_intervals")],
+    [State("morning-news-store", "data"),
+     State("eco-news-store", "data")],
+    prevent_initial_call=True
+)
+def poll_reports(n_intervals, morning_store, eco_store):
+    outputs = []
+    running = False
+    for report_type, store_data in (('morning', morning_store), ('eco', eco_store)):
+        content, data, download, pending = report_status(report_type, store_data)
+        outputs.extend([content, data, download])
+        running = running or pending
+    return outputs + [not running]
@@ -0,0 +1,25 @@
+# services/article_ids.py
+
+import hashlib
+from datetime import datetime
+import pandas as pd
+
+# Format of the publication time in article keys and saved articles
+PUBLISHED_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def article_id(title, published):
+    """Short stable id of an article, derived from its title and publication time.
+
+    `published` is a Timestamp or a string in PUBLISHED_FORMAT, so the same
+    article gets the same id in the news feed and among the saved articles.
+    """
+    if isinstance(published, datetime):
+        published = published.strftime(PUBLISHED_FORMAT)
+    return hashlib.sha1(f"{title}\x1f{published}".encode('utf-8')).hexdigest()[:16]
+
+
+def article_ids(titles, published):
+    """Ids of many articles; `published` is a datetime Series."""
+    published = pd.Series(published).dt.strftime(PUBLISHED_FORMAT)
+    return [article_id(title, when) for title, when in zip(titles, published)]
@@ -0,0 +1,151 @@
+# services/data_cache.py
+
+import glob
+import hashlib
+import os
+import types
+import numpy as np
+import pandas as pd
+from config.settings import Config
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # The cache is only an optimization; sources are parsed directly without it
+    feather = None
+
+# Bump to invalidate every sidecar, e.g. after changing how frames are stored
+CACHE_FORMAT_VERSION = 1
+
+config = Config()
+
+# Helpers defined under this directory are part of a prepare step's fingerprint
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _code_fingerprint(function, seen):
+    """Hash a function's bytecode and that of the app helpers it calls."""
+    code = function.__code__
+    parts = [code.co_code]
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            parts.append(const.co_code)
+        else:
+            parts.append(repr(const).encode())
+    for name in code.co_names:
+        helper = function.__globals__.get(name)
+        if not isinstance(helper, types.FunctionType) or not helper.__code__.co_filename.startswith(APP_ROOT):
+            continue
+        if (helper.__module__, name) not in seen:
+            seen.add((helper.__module__, name))
+            parts.append(_code_fingerprint(helper, seen))
+    return hashlib.sha1(b''.join(parts)).digest()
+
+
+def sidecar_key(source_path, *parts, prepare=None):
+    """Identify one way of reading a source; every cached version shares it."""
+    identity = repr((
+        CACHE_FORMAT_VERSION,
+        os.path.abspath(source_path),
+        parts,
+        _code_fingerprint(prepare, set()) if prepare else None
+    ))
+    return hashlib.sha1(identity.encode()).hexdigest()[:16]
+
+
+def _sidecar_paths(source_path, stat, key, extension='.feather'):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    prefix = os.path.join(config.get_cache_dir(), f"{stem}-{key}-")
+    return f"{prefix}{stat.st_mtime_ns}-{stat.st_size}{extension}", prefix
+
+
+def _drop_stale_sidecars(prefix, sidecar_path, extension):
+    for stale_path in glob.glob(glob.escape(prefix) + '*' + extension):
+        if stale_path != sidecar_path:
+            os.remove(stale_path)
+
+
+def load_sidecar(source_path, stat, key):
+    """Return the cached frame for the source as it was at `stat`, or None."""
+    if feather is None:
+        return None
+    sidecar_path, _ = _sidecar_paths(source_path, stat, key)
+    if not os.path.exists(sidecar_path):
+        return None
+    try:
+        # Uncompressed sidecars are memory-mapped instead of read into buffers
+        return feather.read_feather(sidecar_path, memory_map=True)
+    except Exception as e:
+        print(f"Ignoring unreadable cache {sidecar_path}: {e}")
+        return None
+
+
+def store_sidecar(df, source_path, stat, key):
+    """Cache df as the content of the source at `stat` and drop older versions."""
+    if feather is None:
+        return
+    sidecar_path, prefix = _sidecar_paths(source_path, stat, key)
+    try:
+        os.makedirs(os.path.dirname(sidecar_path), exist_ok=True)
+        tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, sidecar_path)
+        _drop_stale_sidecars(prefix, sidecar_path, '.feather')
+    except Exception as e:
+        print(f"Could not write cache for {sidecar_path}: {e}")
+
+
+def load_sidecar_arrays(source_path, stat, key):
+    """Return the cached numpy arrays derived from the source as it was at `stat`, or None."""
+    sidecar_path, _ = _sidecar_paths(source_path, stat, key, '.npz')
+    if not os.path.exists(sidecar_path):
+        return None
+    try:
+        with np.load(sidecar_path, allow_pickle=False) as arrays:
+            return {name: arrays[name] for name in arrays.files}
+    except Exception as e:
+        print(f"Ignoring unreadable cache {sidecar_path}: {e}")
+        return None
+
+
+def store_sidecar_arrays(arrays, source_path, stat, key):
+    """Cache a dict of numpy arrays derived from the source at `stat` and drop older versions."""
+    sidecar_path, prefix = _sidecar_paths(source_path, stat, key, '.npz')
+    try:
+        os.makedirs(os.path.dirname(sidecar_path), exist_ok=True)
+        tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, sidecar_path)
+        _drop_stale_sidecars(prefix, sidecar_path, '.npz')
+    except Exception as e:
+        print(f"Could not write cache for {sidecar_path}: {e}")
+
+
+def read_cached(reader, source_path, prepare=None, **read_kwargs):
+    """Read a data source through a Feather sidecar keyed by its mtime and size.
+
+    `prepare` post-processes the freshly read frame (date parsing, cleaning)
+    and its output is what gets cached, so warm starts skip both steps. The
+    sidecar is invalidated when the source, the read arguments or the code of
+    `prepare` change. Raises like `reader` when the source is missing.
+    """
+    stat = os.stat(source_path)
+    key = sidecar_key(source_path, reader.__name__, sorted(read_kwargs.items()), prepare=prepare)
+    df = load_sidecar(source_path, stat, key)
+    if df is not None:
+        return df
+
+    df = reader(source_path, **read_kwargs)
+    if prepare is not None:
+        df = prepare(df)
+    df = df.reset_index(drop=True)
+    store_sidecar(df, source_path, stat, key)
+    return df
+
+
+def read_csv_cached(source_path, prepare=None, **read_kwargs):
+    return read_cached(pd.read_csv, source_path, prepare, **read_kwargs)
+
+
+def read_excel_cached(source_path, prepare=None, **read_kwargs):
+    return read_cached(pd.read_excel, source_path, prepare, **read_kwargs)
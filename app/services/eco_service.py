@@ -1,33 +1,80 @@
 # services/eco_service.py
 
 import os
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import date, datetime, timedelta
 from config.settings import Config
+from services.article_ids import PUBLISHED_FORMAT, article_id
+from services.favorites_store import ECO_FAVORITE_COLUMNS
+from services.news_store import news_store
+
+# Number of article cards sent to the browser per page of the news feed
+NEWS_PAGE_SIZE = 30
 
 class EcoService:
     def __init__(self):
         self.config = Config()
 
+    def get_news_snapshot(self):
+        """Get the shared indexed news snapshot."""
+        return news_store.snapshot()
+
     def load_news_data(self):
         """Load all economic news data without date filtering."""
-        try:
-            news_df = pd.read_csv(self.config.config['paths']['economic_news'])
-            news_df['published'] = pd.to_datetime(news_df['published'])
-            news_df = news_df.sort_values('published', ascending=False)
-            return news_df
-        except Exception as e:
-            print(f"Error loading news data: {e}")
-            return pd.DataFrame() # Return empty DataFrame on error
-
-    def create_sentiment_chart(self, news_df):
-        """Create sentiment distribution chart with updated styling."""
-        if news_df is None or news_df.empty:
+        snapshot = self.get_news_snapshot()
+        if snapshot.empty:
+            return pd.DataFrame()
+        return snapshot.latest()
+
+    def get_article(self, article_id):
+        """Get the fields saved with a favorite article, looked up by article id."""
+        snapshot = self.get_news_snapshot()
+        row_id = snapshot.find_article(article_id)
+        if row_id is None:
+            return None
+        row = snapshot.frame.iloc[row_id]
+        article = {column: row.get(column) for column in ECO_FAVORITE_COLUMNS}
+        article = {column: None if pd.isna(value) else value for column, value in article.items()}
+        article['theme'] = article['theme'] or 'Économie'
+        article['published'] = row['published'].strftime(PUBLISHED_FORMAT)
+        return article
+
+    def filter_news_ids(self, sentiment_filter=None, theme_filter=None, period_value='all', start_date=None,
+                        end_date=None, search_query=None, sort_by='date'):
+        """Return the snapshot and the matching row ids, newest first or by search relevance."""
+        snapshot = self.get_news_snapshot()
+        start_range, end_range = self.calculate_date_range(period_value, start_date, end_date)
+        start_datetime = end_datetime = None
+        if start_range and end_range:
+            start_datetime = pd.to_datetime(start_range)
+            end_datetime = pd.to_datetime(end_range) + timedelta(hours=23, minutes=59, seconds=59)
+        ids = snapshot.filter(
+            start=start_datetime,
+            end=end_datetime,
+            sentiment=sentiment_filter if sentiment_filter and sentiment_filter != 'Tous' else None,
+            theme=theme_filter if theme_filter and theme_filter != 'Tous' else None
+        )
+        if search_query and search_query.strip():
+            ids = snapshot.search(search_query.strip(), ids, rank=sort_by == 'relevance')
+        return snapshot, ids
+
+    def filter_news(self, sentiment_filter=None, theme_filter=None, period_value='all', start_date=None, end_date=None,
+                    search_query=None, sort_by='date'):
+        """Filter the news archive using the snapshot indexes, newest first or by search relevance."""
+        snapshot, ids = self.filter_news_ids(sentiment_filter, theme_filter, period_value, start_date, end_date,
+                                             search_query, sort_by)
+        return snapshot.rows(ids)
+
+    def create_sentiment_chart(self, news_df=None, sentiment_counts=None):
+        """Create sentiment distribution chart with updated styling, from articles or precomputed counts."""
+        if sentiment_counts is None and news_df is not None and not news_df.empty:
+            sentiment_counts = news_df['sentiment'].value_counts()
+        if sentiment_counts is None or sentiment_counts.empty:
             return self._create_error_figure("Données de Sentiment non disponibles")
 
-        sentiment_counts = news_df['sentiment'].value_counts()
         fig = px.pie(
             values=sentiment_counts.values,
             names=sentiment_counts.index,
@@ -49,12 +96,14 @@ class EcoService:
         )
         return fig
 
-    def create_theme_chart(self, news_df):
-        """Create theme distribution chart with updated styling."""
-        if news_df is None or news_df.empty:
+    def create_theme_chart(self, news_df=None, theme_counts=None):
+        """Create theme distribution chart with updated styling, from articles or precomputed counts."""
+        if theme_counts is None and news_df is not None and not news_df.empty:
+            theme_counts = news_df['theme'].value_counts()
+        if theme_counts is None or theme_counts.empty:
             return self._create_error_figure("Données de Thème non disponibles")
 
-        theme_counts = news_df['theme'].value_counts().head(10)
+        theme_counts = theme_counts.head(10)
         fig = px.bar(
             x=theme_counts.values,
             y=theme_counts.index,
@@ -97,6 +146,53 @@ class EcoService:
             {'label': 'Période personnalisée', 'value': 'custom'}
         ]
 
+    def news_page_state(self, snapshot, ids, page_ids):
+        """State of the news feed once page_ids are shown: the snapshot version and the last article shown."""
+        cursor = None
+        if len(page_ids):
+            last = snapshot.frame.iloc[page_ids[-1]]
+            cursor = article_id(last['title'], last['published'])
+        return {'version': snapshot.version, 'cursor': cursor, 'total': len(ids)}
+
+    def next_page_start(self, snapshot, ids, page_state):
+        """Position in ids right after the last article shown, or None when the feed must restart from the top.
+
+        Positions shift when the snapshot is reloaded, so the feed only
+        resumes within the snapshot version it was rendered from.
+        """
+        if not page_state or page_state.get('version') != snapshot.version or not page_state.get('cursor'):
+            return None
+        row_id = snapshot.find_article(page_state['cursor'])
+        if row_id is None:
+            return None
+        positions = np.flatnonzero(ids == row_id)
+        return int(positions[0]) + 1 if len(positions) else None
+
+    def get_load_more_button(self, shown, total):
+        """Get style and label of the "Charger plus" button below the news feed."""
+        if shown >= total:
+            return {'display': 'none'}, ''
+        return {
+            'display': 'block',
+            'margin': '10px auto 0 auto',
+            'padding': '10px 24px',
+            'background': self.config.COLORS['card_bg'],
+            'color': self.config.COLORS['secondary'],
+            'border': f'1px solid {self.config.COLORS["secondary"]}',
+            'borderRadius': '20px',
+            'fontSize': '14px',
+            'fontWeight': '500',
+            'cursor': 'pointer'
+        }, f"Charger plus ({total - shown} articles restants)"
+
+    @staticmethod
+    def get_sort_options():
+        """Get ordering options for the news feed."""
+        return [
+            {'label': 'Plus récents', 'value': 'date'},
+            {'label': 'Pertinence', 'value': 'relevance'}
+        ]
+
     @staticmethod
     def calculate_date_range(period_value, start_date=None, end_date=None):
         """Calculate date range based on selection."""
@@ -1,49 +1,40 @@
 # services/favorites_service.py
 
-import os
-import pandas as pd
+from services.favorites_store import eco_favorites_store
 
 class FavoritesService:
-    def __init__(self, favorites_file='my_eco_news.csv'):
-        self.favorites_file = favorites_file
-        
+    def __init__(self, store=None):
+        self.store = store or eco_favorites_store
+
+    def favorite_keys(self):
+        """Get the set of (title, published) keys of the favorite articles"""
+        return self.store.keys()
+
+    def favorite_article_ids(self):
+        """Get the set of article ids of the favorite articles"""
+        return self.store.article_ids()
+
     def load_favorites(self):
-        """Load favorites from CSV file"""
-        if os.path.exists(self.favorites_file):
-            try:
-                return pd.read_csv(self.favorites_file)
-            except pd.errors.EmptyDataError:
-                return pd.DataFrame(columns=['source', 'theme', 'title', 'summary', 'mini_resume', 'sentiment', 'published', 'link'])
-        else:
-            return pd.DataFrame(columns=['source', 'theme', 'title', 'summary', 'mini_resume', 'sentiment', 'published', 'link'])
+        """Load favorites as a DataFrame"""
+        return self.store.load()
 
     def save_to_favorites(self, article_data):
         """Save article to favorites"""
-        favorites_df = self.load_favorites()
-        
-        # Check if article already exists
-        if not ((favorites_df['title'] == article_data['title']) & 
-                (favorites_df['published'] == article_data['published'])).any():
-            # Add new favorite
-            new_row = pd.DataFrame([article_data])
-            favorites_df = pd.concat([favorites_df, new_row], ignore_index=True)
-            
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(self.favorites_file), exist_ok=True)
-            favorites_df.to_csv(self.favorites_file, index=False)
+        self.store.add(article_data)
 
     def remove_from_favorites(self, title, published):
         """Remove article from favorites"""
-        favorites_df = self.load_favorites()
-        favorites_df = favorites_df[~((favorites_df['title'] == title) & 
-                                    (favorites_df['published'] == published))]
-        
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(self.favorites_file), exist_ok=True)
-        favorites_df.to_csv(self.favorites_file, index=False)
+        self.store.remove(title, published)
+
+    def toggle_favorite(self, article_data):
+        """Save or remove an article in one write; returns whether it is now favorited"""
+        return self.store.toggle(article_data)
 
     def is_favorited(self, title, published):
         """Check if article is favorited"""
-        favorites_df = self.load_favorites()
-        return ((favorites_df['title'] == title) & 
-                (favorites_df['published'] == published)).any()
\ No newline at end of file
+        return self.store.contains(title, published)
+
+    def are_favorited(self, keys):
+        """Check a batch of (title, published) keys against a single load of the favorites"""
+        favorite_keys = self.favorite_keys()
+        return [key in favorite_keys for key in keys]
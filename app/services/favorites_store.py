@@ -0,0 +1,198 @@
+# services/favorites_store.py
+
+import os
+import threading
+import pandas as pd
+from config.settings import Config
+from models.database import get_connection_pool
+from services.article_ids import article_id
+
+ECO_FAVORITE_COLUMNS = ['source', 'theme', 'title', 'summary', 'mini_resume', 'sentiment', 'published', 'link']
+STOCK_FAVORITE_COLUMNS = ['stock', 'source', 'title', 'mini_resume', 'sentiment', 'published', 'link']
+
+config = Config()
+
+
+class FavoritesStore:
+    """Saved articles of one kind, stored in a SQLite table keyed by (title, published).
+
+    The database runs in WAL mode so readers never block the writer, and each
+    thread reuses its own pooled connection. Inserts and deletes touch a
+    single row through the primary key instead of rewriting a CSV, and every
+    write bumps a revision counter that readers use to refresh their cached
+    key set.
+    Articles saved in the legacy CSV files are imported on first use.
+    """
+
+    def __init__(self, table, columns, db_path=None, legacy_csv_files=()):
+        self.table = table
+        self.columns = list(columns)
+        self.db_path = db_path or config.get_favorites_db_path()
+        self.legacy_csv_files = list(legacy_csv_files)
+        self.pool = get_connection_pool(self.db_path)
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        # (revision, keys) pair, replaced in one assignment so a key set is never paired with a newer revision
+        self._keys_state = (None, frozenset())
+        self._article_ids = (None, set())
+
+    def _connection(self):
+        conn = self.pool.connection()
+        if not self._initialized:
+            self._init_db(conn)
+        return conn
+
+    def _init_db(self, conn):
+        """Create the table and import the legacy CSV files once"""
+        with self._init_lock:
+            if self._initialized:
+                return
+            data_columns = ', '.join(f'{column} TEXT' for column in self.columns if column not in ('title', 'published'))
+            with conn:
+                conn.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {self.table} (
+                        title TEXT NOT NULL,
+                        published TEXT NOT NULL,
+                        {data_columns},
+                        treated INTEGER NOT NULL DEFAULT 0,
+                        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (title, published)
+                    )
+                ''')
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS favorites_meta (
+                        name TEXT PRIMARY KEY,
+                        revision INTEGER NOT NULL DEFAULT 0,
+                        migrated INTEGER NOT NULL DEFAULT 0
+                    )
+                ''')
+                conn.execute('INSERT OR IGNORE INTO favorites_meta (name) VALUES (?)', (self.table,))
+                migrated = conn.execute('SELECT migrated FROM favorites_meta WHERE name = ?', (self.table,)).fetchone()[0]
+                if not migrated:
+                    self._import_legacy_csv(conn)
+                    conn.execute('UPDATE favorites_meta SET migrated = 1, revision = revision + 1 WHERE name = ?',
+                                 (self.table,))
+            self._initialized = True
+
+    def _import_legacy_csv(self, conn):
+        for csv_file in self.legacy_csv_files:
+            if not os.path.exists(csv_file):
+                continue
+            try:
+                legacy_df = pd.read_csv(csv_file, dtype=str)
+            except pd.errors.EmptyDataError:
+                continue
+            except Exception as e:
+                print(f"Error importing favorites from {csv_file}: {e}")
+                continue
+            if 'treated' not in legacy_df.columns:
+                legacy_df['treated'] = 'False'
+            legacy_df['treated'] = legacy_df['treated'].isin(['True', 'true', '1']).astype(int)
+            legacy_df = legacy_df.reindex(columns=self.columns + ['treated']).dropna(subset=['title', 'published'])
+            legacy_df = legacy_df.astype(object).where(legacy_df.notna(), None)
+            conn.executemany(self._insert_sql(with_treated=True), legacy_df.itertuples(index=False, name=None))
+            print(f"Imported {len(legacy_df)} favorites from {csv_file}")
+
+    def _insert_sql(self, with_treated=False):
+        columns = self.columns + (['treated'] if with_treated else [])
+        return (f'INSERT OR IGNORE INTO {self.table} ({", ".join(columns)}) '
+                f'VALUES ({", ".join("?" for _ in columns)})')
+
+    def _bump_revision(self, conn):
+        conn.execute('UPDATE favorites_meta SET revision = revision + 1 WHERE name = ?', (self.table,))
+
+    def revision(self):
+        """Counter incremented by every write, from any thread or process"""
+        conn = self._connection()
+        return conn.execute('SELECT revision FROM favorites_meta WHERE name = ?', (self.table,)).fetchone()[0]
+
+    def add(self, article_data):
+        """Save an article; returns False if it was already saved"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(self._insert_sql(), [article_data.get(column) for column in self.columns])
+            if cursor.rowcount:
+                self._bump_revision(conn)
+        return cursor.rowcount > 0
+
+    def remove(self, title, published):
+        """Remove one saved article"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(f'DELETE FROM {self.table} WHERE title = ? AND published = ?', (title, published))
+            if cursor.rowcount:
+                self._bump_revision(conn)
+        return cursor.rowcount > 0
+
+    def remove_by_title(self, title):
+        """Remove every saved article with this title"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(f'DELETE FROM {self.table} WHERE title = ?', (title,))
+            if cursor.rowcount:
+                self._bump_revision(conn)
+        return cursor.rowcount > 0
+
+    def toggle(self, article_data):
+        """Save the article, or remove it if it was saved; returns whether it is now saved"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(f'DELETE FROM {self.table} WHERE title = ? AND published = ?',
+                                  (article_data.get('title'), article_data.get('published')))
+            saved = cursor.rowcount == 0
+            if saved:
+                conn.execute(self._insert_sql(), [article_data.get(column) for column in self.columns])
+            self._bump_revision(conn)
+        return saved
+
+    def mark_treated(self, titles):
+        """Flag the saved articles with these titles as included in a report"""
+        conn = self._connection()
+        with conn:
+            cursor = conn.executemany(f'UPDATE {self.table} SET treated = 1 WHERE title = ?',
+                                      [(title,) for title in titles])
+            if cursor.rowcount:
+                self._bump_revision(conn)
+        return True
+
+    def keys(self):
+        """Set of (title, published) keys, re-read only after a write"""
+        revision = self.revision()
+        keys_revision, keys = self._keys_state
+        if revision != keys_revision:
+            rows = self._connection().execute(f'SELECT title, published FROM {self.table}').fetchall()
+            keys = frozenset(rows)
+            self._keys_state = (revision, keys)
+        return keys
+
+    def article_ids(self):
+        """Set of the article ids of the saved articles, recomputed only after a write"""
+        keys = self.keys()
+        computed_for, ids = self._article_ids
+        if computed_for is not keys:
+            ids = {article_id(title, published) for title, published in keys}
+            self._article_ids = (keys, ids)
+        return ids
+
+    def contains(self, title, published):
+        return (title, published) in self.keys()
+
+    def load(self):
+        """All saved articles as a DataFrame, in the order they were saved"""
+        conn = self._connection()
+        columns = self.columns + ['treated']
+        rows = conn.execute(f'SELECT {", ".join(columns)} FROM {self.table} ORDER BY rowid').fetchall()
+        saved_df = pd.DataFrame(rows, columns=columns)
+        saved_df['treated'] = saved_df['treated'].astype(bool)
+        return saved_df
+
+
+# Global instances
+eco_favorites_store = FavoritesStore(
+    'eco_favorites', ECO_FAVORITE_COLUMNS,
+    legacy_csv_files=['my_eco_news.csv']
+)
+stock_favorites_store = FavoritesStore(
+    'stock_favorites', STOCK_FAVORITE_COLUMNS,
+    legacy_csv_files=['/Users/mac/Sentiment Analysis Press/app/my_stock_news.csv', 'my_stock_news.csv']
+)
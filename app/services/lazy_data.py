@@ -0,0 +1,112 @@
+# services/lazy_data.py
+
+import threading
+import time
+
+_UNSET = object()
+
+
+class LazyData:
+    """Data and figures of a page, built on first use instead of at import.
+
+    The loader runs once, under a lock, in whichever request or warm-up
+    thread asks first; concurrent callers wait for that load instead of
+    repeating it. reload() builds a fresh value and swaps it in, so readers
+    keep the previous one until the new one is ready.
+
+    Loaders that fall back to placeholder data instead of raising are given
+    a check telling whether a value was really loaded: a reload failing it
+    raises and keeps the current value.
+    """
+
+    def __init__(self, name, loader, check=None):
+        self.name = name
+        self.loader = loader
+        self.check = check
+        # The value and its version, replaced together so readers never pair one with the other's
+        self._current = (_UNSET, 0)
+        self._lock = threading.Lock()
+        self.load_seconds = None
+
+    @property
+    def loaded(self):
+        return self._current[0] is not _UNSET
+
+    @property
+    def version(self):
+        """Incremented by every load, to key results derived from the value"""
+        return self._current[1]
+
+    def get(self):
+        """Get the value, loading it on the first call"""
+        return self.get_versioned()[0]
+
+    def get_versioned(self):
+        """Get the value and the version it was loaded as, loading it on the first call"""
+        current = self._current
+        if current[0] is _UNSET:
+            with self._lock:
+                if self._current[0] is _UNSET:
+                    self._current = (self._load(), self._current[1] + 1)
+                current = self._current
+        return current
+
+    def reload(self):
+        """Load the value again and replace the current one"""
+        with self._lock:
+            value = self._load()
+            if self.check is not None and not self.check(value):
+                raise RuntimeError(f"{self.name} data could not be loaded, keeping the current data")
+            self._current = (value, self._current[1] + 1)
+        return value
+
+    def _load(self):
+        started = time.perf_counter()
+        value = self.loader()
+        self.load_seconds = time.perf_counter() - started
+        print(f"Loaded {self.name} data in {self.load_seconds:.2f}s")
+        return value
+
+
+# Every page's lazy data, in registration order
+_registry = {}
+
+# Loaders of data owned by a service rather than by LazyData, only run by warm_up()
+_warm_up_loaders = {}
+
+
+def lazy_data(name, loader, check=None):
+    """Create and register the lazy data of a page"""
+    data = _registry[name] = LazyData(name, loader, check)
+    return data
+
+
+def warm_up_loader(name, loader):
+    """Have warm_up() also call a service's own first-use loader"""
+    _warm_up_loaders[name] = loader
+
+
+def _load_all(targets):
+    for name, load in targets:
+        try:
+            load()
+        except Exception as e:
+            print(f"Error warming up {name} data: {e}")
+
+
+def warm_up(names=None, background=True):
+    """Load the registered page data ahead of the first request.
+
+    With background=True the loads run in a daemon thread, so the worker
+    starts serving right away and a request arriving first simply waits for
+    the load in progress.
+    """
+    loaders = {name: data.get for name, data in _registry.items()}
+    loaders.update(_warm_up_loaders)
+    targets = [(name, load) for name, load in loaders.items() if names is None or name in names]
+    if not background:
+        _load_all(targets)
+        return None
+    thread = threading.Thread(target=_load_all, args=(targets,), name='page-data-warm-up', daemon=True)
+    thread.start()
+    return thread
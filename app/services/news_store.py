@@ -0,0 +1,357 @@
+# services/news_store.py
+
+import io
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config.settings import Config
+from services.article_ids import article_ids
+from services.data_cache import (load_sidecar, load_sidecar_arrays, sidecar_key, store_sidecar,
+                                 store_sidecar_arrays)
+from services.lazy_data import warm_up_loader
+from services.search_index import SearchIndex
+
+# Columns kept as integer codes with one row bitmap per category
+INDEXED_COLUMNS = ['sentiment', 'theme', 'source']
+
+# Columns covered by the full-text search index
+SEARCH_COLUMNS = ['title', 'mini_resume']
+
+# Minimum number of seconds between two stat() calls on the news CSV
+CHECK_INTERVAL = 5
+
+# Bytes before the consumed offset compared on append to detect a rewritten file
+TAIL_MARKER_SIZE = 256
+
+
+def parse_news_csv(data):
+    """Parse raw CSV bytes (header included) into a news frame."""
+    news_df = pd.read_csv(io.BytesIO(data))
+    news_df['published'] = pd.to_datetime(news_df['published'], errors='coerce')
+    # Undated rows cannot live in the sorted timestamp index
+    return news_df.dropna(subset=['published']).reset_index(drop=True)
+
+
+def _index_rows(search_index, rows):
+    """Add rows, the next ones after those already indexed, to the search index."""
+    search_index.add(
+        len(search_index),
+        *(rows[column] if column in rows.columns else [''] * len(rows) for column in SEARCH_COLUMNS)
+    )
+
+
+class NewsSnapshot:
+    """In-memory view of the economic news archive.
+
+    Rows are stored sorted by ascending `published`, so a row id is simply a
+    position in the frame. Date filters are binary searches on the int64
+    timestamp index and category filters are bitmap intersections.
+
+    A snapshot's rows never change. The search index and the article id
+    index are append-only and shared with the snapshots appended after this
+    one, so lookups keep only the row ids below len(self).
+    """
+
+    def __init__(self, news_df, version=0, search_index=None):
+        self.version = version
+        news_df = news_df.sort_values('published', kind='mergesort').reset_index(drop=True)
+        published = news_df['published'].to_numpy(dtype='datetime64[ns]').view('int64') \
+            if not news_df.empty else np.empty(0, dtype='int64')
+        codes = {}
+        categories = {}
+        for column in INDEXED_COLUMNS:
+            if column not in news_df.columns:
+                continue
+            categorical = pd.Categorical(news_df[column])
+            codes[column] = categorical.codes
+            categories[column] = list(categorical.categories)
+        if search_index is None:
+            search_index = SearchIndex()
+        # A saved index already covers the leading rows; only index the rest
+        _index_rows(search_index, news_df.iloc[len(search_index):])
+        self._set(news_df, published, codes, categories, search_index)
+
+    def _set(self, frame, published, codes, categories, search_index, bitmaps=None, article_index=None):
+        self.frame = frame
+        self.published = published
+        self.codes = codes
+        self.categories = categories
+        self.bitmaps = bitmaps if bitmaps is not None else {
+            column: {value: column_codes == code for code, value in enumerate(categories[column])}
+            for column, column_codes in codes.items()
+        }
+        published.setflags(write=False)
+        for column, column_codes in codes.items():
+            column_codes.setflags(write=False)
+            for bitmap in self.bitmaps[column].values():
+                bitmap.setflags(write=False)
+        self.search_index = search_index
+        self._article_index = article_index
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def date_bounds(self, start=None, end=None):
+        """Return the [lo, hi) row range published between start and end (inclusive)."""
+        lo, hi = 0, len(self.published)
+        if start is not None:
+            lo = int(np.searchsorted(self.published, pd.Timestamp(start).value, side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(self.published, pd.Timestamp(end).value, side='right'))
+        return lo, max(lo, hi)
+
+    def filter(self, start=None, end=None, sentiment=None, theme=None, source=None):
+        """Return matching row ids, newest first."""
+        lo, hi = self.date_bounds(start, end)
+        mask = None
+        for column, value in (('sentiment', sentiment), ('theme', theme), ('source', source)):
+            if value is None:
+                continue
+            bitmap = self.bitmaps.get(column, {}).get(value)
+            if bitmap is None:
+                return np.empty(0, dtype='int64')
+            mask = bitmap[lo:hi] if mask is None else mask & bitmap[lo:hi]
+        if mask is None:
+            ids = np.arange(lo, hi, dtype='int64')
+        else:
+            ids = np.flatnonzero(mask) + lo
+        return ids[::-1]
+
+    def search(self, query, ids, rank=False):
+        """Keep the ids matching the search query, optionally ordered by relevance."""
+        matches = self.search_index.search(query)
+        # Sorted doc ids; those past this snapshot belong to later ones
+        matches = matches[:np.searchsorted(matches, len(self))]
+        ids = ids[np.isin(ids, matches, assume_unique=True)]
+        if rank:
+            ids = self.search_index.rank(query, ids, len(self))
+        return ids
+
+    def append(self, tail_df, version):
+        """Return a new snapshot with tail_df merged in.
+
+        When the new rows are not older than the newest existing row, row ids
+        of existing articles are unchanged: the timestamps, category codes and
+        bitmaps are extended with the tail only, and the shared search index
+        indexes just the new rows. Otherwise the snapshot is rebuilt.
+        """
+        if tail_df.empty:
+            return self
+        tail_df = tail_df.sort_values('published', kind='mergesort').reset_index(drop=True)
+        frame = pd.concat([self.frame, tail_df], ignore_index=True)
+        tail_published = tail_df['published'].to_numpy(dtype='datetime64[ns]').view('int64')
+        if (self.empty or tail_published[0] < self.published[-1] or set(tail_df.columns) != set(self.frame.columns)
+                or len(self.search_index) != len(self)):
+            return NewsSnapshot(frame, version)
+
+        codes = {}
+        categories = {}
+        bitmaps = {}
+        for column, column_codes in self.codes.items():
+            known = set(self.categories[column])
+            added = [value for value in pd.unique(tail_df[column].dropna()) if value not in known]
+            categories[column] = self.categories[column] + added
+            tail_codes = pd.Categorical(tail_df[column], categories=categories[column]).codes
+            codes[column] = np.concatenate([column_codes, tail_codes])
+            # Categories first seen in the tail get an all-False bitmap over the existing rows
+            bitmaps[column] = {
+                value: np.concatenate([self.bitmaps[column].get(value, np.zeros(len(self), dtype=bool)),
+                                       tail_codes == code])
+                for code, value in enumerate(categories[column])
+            }
+
+        _index_rows(self.search_index, tail_df)
+        article_index = self._article_index
+        if article_index is not None:
+            for article_id, row_id in zip(article_ids(tail_df['title'], tail_df['published']),
+                                          range(len(self), len(frame))):
+                article_index.setdefault(article_id, row_id)
+
+        snapshot = NewsSnapshot.__new__(NewsSnapshot)
+        snapshot.version = version
+        snapshot._set(frame, np.concatenate([self.published, tail_published]), codes, categories,
+                      self.search_index, bitmaps, article_index)
+        return snapshot
+
+    def counts(self, column, ids):
+        """Count the given rows per category of an indexed column, most frequent first."""
+        codes = self.codes.get(column)
+        if codes is None or len(ids) == 0:
+            return pd.Series(dtype='int64')
+        selected = codes[ids]
+        counts = np.bincount(selected[selected >= 0], minlength=len(self.categories[column]))
+        counts = pd.Series(counts, index=self.categories[column])
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+    def find_article(self, article_id):
+        """Row id of the article with this id, or None. The id index is built on first use."""
+        article_index = self._article_index
+        if article_index is None:
+            ids = article_ids(self.frame['title'], self.frame['published']) if not self.empty else []
+            article_index = {}
+            for row_id, article in enumerate(ids):
+                article_index.setdefault(article, row_id)
+            self._article_index = article_index
+        row_id = article_index.get(article_id)
+        return row_id if row_id is not None and row_id < len(self) else None
+
+    def rows(self, ids):
+        """Materialize the given row ids as a DataFrame, in the given order."""
+        return self.frame.iloc[ids]
+
+    def latest(self):
+        """All rows, newest first."""
+        return self.frame.iloc[::-1]
+
+
+class NewsStore:
+    """Process-wide holder of the economic news snapshot.
+
+    The CSV is stat()ed at most every CHECK_INTERVAL seconds and only parsed
+    again when its mtime or size changed. The new snapshot then replaces the
+    old one in a single assignment, so callbacks always read a consistent view.
+    When the background refresh is enabled, the scheduler does the reloads and
+    requests only wait for the very first load.
+    """
+
+    def __init__(self, path=None, check_interval=CHECK_INTERVAL):
+        self.config = Config()
+        self.path = path or self.config.get_news_csv_path()
+        self.check_interval = check_interval
+        self.scheduled = self.config.get_refresh_enabled()
+        self._snapshot = None
+        self._signature = None
+        self._last_check = 0.0
+        self._offset = 0
+        self._header = self._marker = b''
+        self._sidecar_key = sidecar_key(self.path, 'economic_news', prepare=parse_news_csv)
+        # The search postings are cached next to the frame, for the same file signature
+        self._index_key = sidecar_key(self.path, 'search_index', SearchIndex.FORMAT_VERSION, SEARCH_COLUMNS,
+                                      prepare=parse_news_csv)
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._snapshot is not None
+
+    def snapshot(self):
+        """Get the current snapshot, reloading it if the CSV changed."""
+        if self._snapshot is None or (not self.scheduled
+                                      and time.monotonic() - self._last_check >= self.check_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error loading news data: {e}")
+        return self._snapshot
+
+    def refresh(self, force=False):
+        """Reload the CSV if it changed on disk since the last load.
+
+        A failed load raises and keeps the current snapshot, signature and
+        offset, so the next check tries again.
+        """
+        # Only the first load blocks; later callers keep serving the current
+        # snapshot while another thread parses the new file
+        if not self._lock.acquire(blocking=self._snapshot is None):
+            return self._snapshot
+        try:
+            self._last_check = time.monotonic()
+            signature = self._stat()
+            if self._snapshot is not None and signature == self._signature and not force:
+                return self._snapshot
+            version = self._snapshot.version + 1 if self._snapshot is not None else 0
+            snapshot = None
+            try:
+                if not force and self._grew(signature):
+                    snapshot = self._load_tail(version)
+                if snapshot is None:
+                    snapshot = self._load(version)
+            except Exception:
+                if self._snapshot is None:
+                    # Serve an empty feed until the file can be read
+                    self._snapshot = NewsSnapshot(pd.DataFrame(columns=['published']), version)
+                raise
+            self._signature = signature
+            self._snapshot = snapshot
+            return snapshot
+        finally:
+            self._lock.release()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _grew(self, signature):
+        return (self._snapshot is not None and not self._snapshot.empty
+                and signature is not None and self._signature is not None
+                and signature[1] > self._signature[1])
+
+    def _load(self, version):
+        """Load the whole file and its search postings, from their binary sidecars when it is unchanged, and remember how far it was consumed."""
+        stat = os.stat(self.path)
+        with open(self.path, 'rb') as f:
+            news_df = load_sidecar(self.path, stat, self._sidecar_key)
+            if news_df is not None:
+                end = stat.st_size
+            else:
+                data = f.read(stat.st_size)
+                # Stop at the last complete line; a partially written row is read on the next append
+                end = data.rfind(b'\n') + 1 or len(data)
+                news_df = parse_news_csv(data[:end])
+                if end == stat.st_size:
+                    store_sidecar(news_df, self.path, stat, self._sidecar_key)
+            f.seek(0)
+            header = f.readline()
+            f.seek(max(0, end - TAIL_MARKER_SIZE))
+            marker = f.read(end - max(0, end - TAIL_MARKER_SIZE))
+        search_index = None
+        if end == stat.st_size:
+            arrays = load_sidecar_arrays(self.path, stat, self._index_key)
+            if arrays is not None and len(arrays['doc_lengths']) == len(news_df):
+                search_index = SearchIndex.from_arrays(arrays)
+        snapshot = NewsSnapshot(news_df, version, search_index=search_index)
+        if search_index is None and end == stat.st_size:
+            store_sidecar_arrays(snapshot.search_index.to_arrays(), self.path, stat, self._index_key)
+        # Only a successful load moves the append position
+        self._offset, self._header, self._marker = end, header, marker
+        return snapshot
+
+    def _load_tail(self, version):
+        """Parse only the bytes appended since the last load.
+
+        Returns None when the file was rewritten rather than appended to, in
+        which case the caller falls back to a full reload.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                if f.read(len(self._header)) != self._header:
+                    return None
+                f.seek(self._offset - len(self._marker))
+                if f.read(len(self._marker)) != self._marker:
+                    return None
+                tail = f.read()
+            end = tail.rfind(b'\n') + 1
+            if end == 0:
+                return self._snapshot
+            tail_df = parse_news_csv(self._header + tail[:end])
+        except Exception as e:
+            print(f"Error reading appended news data, reloading: {e}")
+            return None
+        snapshot = self._snapshot.append(tail_df, version)
+        self._offset += end
+        self._marker = (self._marker + tail[:end])[-TAIL_MARKER_SIZE:]
+        return snapshot
+
+
+# Global instance
+news_store = NewsStore()
+warm_up_loader('news', news_store.snapshot)
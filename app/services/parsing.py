@@ -0,0 +1,93 @@
+# services/parsing.py
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Date formats found in the Casablanca bourse exports, most common first
+DATE_FORMATS = ('%d/%m/%Y', '%Y-%m-%d', '%m/%d/%Y')
+
+# Parsed timestamps per (formats, dayfirst), keyed by the original string
+_date_caches = {}
+MAX_CACHED_DATES = 100000
+
+
+def _infer_date(value, dayfirst):
+    try:
+        return pd.to_datetime(value, dayfirst=dayfirst)
+    except (ValueError, TypeError, OverflowError):
+        return pd.NaT
+
+
+def parse_dates(values, formats=DATE_FORMATS, dayfirst=True):
+    """Parse a column of dates written in any of several formats.
+
+    Each distinct string is parsed once: every format is tried over all the
+    strings still unparsed in a single vectorized call, and only the
+    leftovers fall back to per-value pandas inference. Results are cached
+    across calls, so reloading the same history is mostly dictionary lookups.
+    Unparseable values become NaT.
+    """
+    series = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    codes, uniques = pd.factorize(series)
+    cache = _date_caches.setdefault((tuple(formats), dayfirst), {})
+    if len(cache) > MAX_CACHED_DATES:
+        cache.clear()
+
+    uniques = pd.Series(uniques, dtype=object)
+    parsed = pd.Series(pd.to_datetime(uniques.map(cache), errors='coerce'), dtype='datetime64[ns]')
+    is_text = uniques.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    remaining = parsed.isna().to_numpy() & np.array([value not in cache for value in uniques], dtype=bool)
+
+    # Non-string values (datetime objects from Excel, numbers) are converted directly
+    direct = remaining & ~is_text
+    if direct.any():
+        parsed[direct] = pd.to_datetime(uniques[direct], errors='coerce')
+        remaining &= ~direct
+
+    for fmt in formats:
+        if not remaining.any():
+            break
+        attempt = pd.to_datetime(uniques[remaining], format=fmt, errors='coerce')
+        hits = np.flatnonzero(remaining)[attempt.notna().to_numpy()]
+        parsed[hits] = attempt[attempt.notna()].to_numpy()
+        remaining[hits] = False
+
+    for position in np.flatnonzero(remaining):
+        parsed[position] = _infer_date(uniques[position], dayfirst)
+
+    for value, timestamp in zip(uniques[is_text], parsed[is_text]):
+        cache[value] = timestamp
+
+    values = parsed.to_numpy()
+    result = np.where(codes >= 0, values[np.maximum(codes, 0)], np.datetime64('NaT'))
+    return pd.Series(result, index=series.index, dtype='datetime64[ns]')
+
+
+# Thousands separators: plain, non-breaking and narrow no-break spaces
+_THOUSANDS_SEPARATORS = re.compile(r'[\s\u00a0\u202f]')
+
+# read_csv options that decode "1 390,84" natively in the C parser
+EUROPEAN_CSV_OPTIONS = {'decimal': ',', 'thousands': ' '}
+
+
+def parse_european_numbers(values, fill_value=0):
+    """Convert European formatted numbers ("1 390,84") to float64.
+
+    Columns the CSV reader already decoded (see EUROPEAN_CSV_OPTIONS) are
+    only cast, without going through strings. Text columns, e.g. with
+    non-breaking spaces, are decoded with vectorized string operations.
+    Empty or invalid values become fill_value.
+    """
+    series = pd.Series(values)
+    if not pd.api.types.is_numeric_dtype(series):
+        if series.dtype == object:
+            # Mixed cells (e.g. floats among strings) are decoded from their text form
+            series = series.astype(str)
+        series = series.str.replace(_THOUSANDS_SEPARATORS, '', regex=True).str.replace(',', '.', regex=False)
+        series = pd.to_numeric(series, errors='coerce')
+    return series.astype('float64').fillna(fill_value)
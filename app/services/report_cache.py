@@ -0,0 +1,142 @@
+# services/report_cache.py
+
+import hashlib
+import json
+import os
+import threading
+from config.settings import Config
+
+config = Config()
+
+# Keys are 40 hex characters; anything else is not a cached report
+_KEY_LENGTH = 40
+
+
+def selection_key(articles):
+    """Hash of an ordered article selection, identical for identical selections"""
+    payload = json.dumps([[article.get('title'), article.get('mini_resume')] for article in articles],
+                         ensure_ascii=False)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def report_key(articles, template_version):
+    """Content address of the PDF rendering these articles, in this order, with this template"""
+    return hashlib.sha1(f"{template_version}:{selection_key(articles)}".encode()).hexdigest()
+
+
+class ReportCache:
+    """Rendered PDF reports stored on disk under their content address.
+
+    A report is identified by the hash of the ordered (title, mini_resume)
+    list it renders and of the template version, so generating the same
+    selection again is served from disk without calling the renderer.
+    The files are bounded to max_bytes in total; the least recently used
+    ones (by mtime, refreshed on every hit) are deleted first.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.path.join(config.get_cache_dir(), 'reports')
+        self.max_bytes = max_bytes if max_bytes is not None else config.get_report_cache_max_bytes()
+        self._lock = threading.Lock()
+        self._sizes = None
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _scan(self):
+        """Sizes of the cached files currently in the directory, from every process"""
+        sizes = {}
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                key, ext = os.path.splitext(name)
+                if ext == '.pdf' and len(key) == _KEY_LENGTH:
+                    try:
+                        sizes[key] = os.path.getsize(os.path.join(self.directory, name))
+                    except OSError:
+                        # Evicted by another process since the listing
+                        pass
+        return sizes
+
+    def _index(self):
+        """Sizes of the cached files, read from the directory on first use"""
+        if self._sizes is None:
+            self._sizes = self._scan()
+        return self._sizes
+
+    def file(self, key):
+        """Path of the cached report to serve, or None; not counted as a lookup"""
+        if len(key) != _KEY_LENGTH or any(char not in '0123456789abcdef' for char in key):
+            return None
+        path = self.path(key)
+        return path if os.path.exists(path) else None
+
+    def get(self, key):
+        """Path of the cached report, or None"""
+        with self._lock:
+            sizes = self._index()
+            path = self.path(key)
+            try:
+                os.utime(path)
+                if key not in sizes:
+                    # Written by another worker since the directory was read
+                    sizes[key] = os.path.getsize(path)
+            except OSError:
+                sizes.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return path
+
+    def put(self, key, content):
+        """Store a rendered report and evict the least recently used ones beyond max_bytes"""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self.path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+            self._evict(keep=key)
+            return path
+
+    def _evict(self, keep):
+        # Other workers share the directory: total and evict their files too
+        self._sizes = sizes = self._scan()
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+        by_age = sorted((key for key in sizes if key != keep), key=self._mtime)
+        for key in by_age:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+            total -= sizes.pop(key)
+
+    def _mtime(self, key):
+        try:
+            return os.path.getmtime(self.path(key))
+        except OSError:
+            return 0
+
+    def stats(self):
+        """Hit ratio and disk usage, for monitoring"""
+        with self._lock:
+            sizes = self._index()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'reports': len(sizes),
+                'bytes_stored': sum(sizes.values()),
+                'max_bytes': self.max_bytes
+            }
+
+
+# Global instance
+report_cache = ReportCache()
@@ -0,0 +1,138 @@
+# services/report_jobs.py
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Reports generated at the same time; further jobs wait in the queue
+REPORT_WORKERS = 2
+# Seconds a finished job stays available to the polling callbacks
+JOB_TTL = 3600
+# Seconds to wait for the PDF service
+PDF_SERVER_TIMEOUT = 30
+
+
+class ReportJob:
+    """State of one report generation, shared with the polling callbacks"""
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = 'queued'
+        self.progress = 0.0
+        self.message = 'En attente'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'error')
+
+    def update(self, progress, message=None):
+        """Report progress, between 0 and 1, from the running task"""
+        self.progress = progress
+        if message is not None:
+            self.message = message
+
+
+class ReportJobQueue:
+    """Background report generation with bounded concurrency.
+
+    submit() returns a job id right away and the task runs in a thread pool
+    of max_workers threads, so a slow renderer never holds a Dash worker.
+    Submitting the same key as a queued or running job returns that job
+    instead of starting another one.
+    """
+
+    def __init__(self, max_workers=REPORT_WORKERS, job_ttl=JOB_TTL):
+        self.job_ttl = job_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-job')
+        self._jobs = {}
+        self._active = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, task, *args):
+        """Queue task(job, *args); its return value becomes the job result"""
+        with self._lock:
+            self._purge()
+            job = self._active.get(key)
+            if job is not None:
+                return job.id
+            job = ReportJob(key)
+            self._jobs[job.id] = job
+            self._active[key] = job
+        self._executor.submit(self._run, job, task, args)
+        return job.id
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def _run(self, job, task, args):
+        job.status = 'running'
+        job.message = 'Génération en cours'
+        try:
+            job.result = task(job, *args)
+            job.progress = 1.0
+            job.status = 'done'
+        except Exception as e:
+            print(f"Error generating report: {e}")
+            job.error = str(e)
+            job.status = 'error'
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+
+    def _purge(self):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and time.time() - job.finished_at > self.job_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self):
+        """Number of jobs per status, for monitoring"""
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
+
+
+def request_pdf(job, server_url, articles, timeout=PDF_SERVER_TIMEOUT, progress=0.1):
+    """Have the PDF service render the articles; returns the file name, article count and download URL"""
+    job.update(progress, 'Envoi des articles au serveur PDF')
+    try:
+        response = requests.post(f"{server_url}/generate-pdf", json={"articles": articles}, timeout=timeout)
+    except requests.RequestException as e:
+        raise RuntimeError(f"Erreur de connexion au serveur: {e}") from e
+    if response.status_code != 200:
+        raise RuntimeError(f"Erreur lors de la génération du PDF: {response.status_code}")
+    result = response.json()
+    filename = result.get('filename', '')
+    return {
+        'filename': filename,
+        'articles_count': result.get('articles_count', 0),
+        'download_url': f"{server_url}/download-pdf/{filename}"
+    }
+
+
+def download_pdf(job, download_url, timeout=PDF_SERVER_TIMEOUT, progress=0.7):
+    """Fetch a PDF rendered by the PDF service"""
+    job.update(progress, 'Téléchargement du PDF')
+    try:
+        response = requests.get(download_url, timeout=timeout)
+    except requests.RequestException as e:
+        raise RuntimeError(f"Erreur de connexion au serveur: {e}") from e
+    if response.status_code != 200:
+        raise RuntimeError(f"Erreur lors du téléchargement du PDF: {response.status_code}")
+    return response.content
+
+
+# Global instance
+report_jobs = ReportJobQueue()
@@ -0,0 +1,164 @@
+# services/scheduler.py
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Threads loading sources at the same time
+REFRESH_WORKERS = 4
+# Seconds between two checks for due sources
+TICK_SECONDS = 1.0
+
+
+class RefreshJob:
+    """One data source, refreshed every `interval` seconds.
+
+    When the source's files are given, the refresh is skipped while none of
+    them changed (same mtime and size), so the published snapshot and every
+    view derived from its data version stay valid. When `loaded` is given,
+    the refresh is also skipped while the source was never loaded: a page's
+    first visit loads it, not the scheduler.
+    """
+
+    def __init__(self, name, refresh, interval, paths=(), loaded=None):
+        self.name = name
+        self.refresh = refresh
+        self.interval = interval
+        self.paths = [path for path in paths if path]
+        self.loaded = loaded
+        self.next_run = time.monotonic() + interval
+        self.running = False
+        self.signature = None
+        self.last_refresh = None
+        self.last_duration = None
+        self.last_check = None
+        self.last_error = None
+        self.runs = 0
+        self.skipped = 0
+        self.errors = 0
+
+    def files_signature(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def stats(self):
+        return {
+            'interval': self.interval,
+            'running': self.running,
+            'last_refresh': self.last_refresh.isoformat() if self.last_refresh else None,
+            'last_duration': self.last_duration,
+            'last_check': self.last_check.isoformat() if self.last_check else None,
+            'last_error': self.last_error,
+            'runs': self.runs,
+            'skipped': self.skipped,
+            'errors': self.errors
+        }
+
+
+class RefreshScheduler:
+    """Refreshes the dashboard data sources in the background.
+
+    A daemon thread submits every due source to a thread pool; each source
+    loads its data and publishes the new snapshot by assignment, so requests
+    keep reading the previous one and never wait for a load. A source is
+    never refreshed twice at the same time.
+    """
+
+    def __init__(self, max_workers=REFRESH_WORKERS, tick=TICK_SECONDS):
+        self.max_workers = max_workers
+        self.tick = tick
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor = None
+        self._thread = None
+
+    def add(self, name, refresh, interval, paths=(), loaded=None):
+        """Register a source; its first refresh runs one interval after it is added.
+
+        refresh() must raise when the source cannot be loaded, so a failed
+        refresh is retried and its files are not marked as loaded.
+        """
+        with self._lock:
+            self._jobs[name] = RefreshJob(name, refresh, interval, paths, loaded)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='data-refresh')
+        self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=True):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._executor.shutdown(wait=wait)
+        self._thread = self._executor = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [job for job in self._jobs.values() if not job.running and job.next_run <= now]
+                for job in due:
+                    job.running = True
+            for job in due:
+                self._executor.submit(self._refresh, job)
+            self._stop.wait(self.tick)
+
+    def _refresh(self, job, force=False):
+        started = time.perf_counter()
+        try:
+            # Taken before loading, so a change made during the load is picked up next time
+            signature = job.files_signature()
+            if job.loaded is not None and not job.loaded() and not force:
+                # The first load reads files at least as recent as these
+                job.signature = signature
+                job.skipped += 1
+            elif job.paths and signature == job.signature and not force:
+                job.skipped += 1
+            else:
+                job.refresh()
+                job.signature = signature
+                job.runs += 1
+                job.last_refresh = datetime.now()
+                job.last_duration = time.perf_counter() - started
+                job.last_error = None
+        except Exception as e:
+            job.errors += 1
+            job.last_error = str(e)
+            print(f"Error refreshing {job.name} data: {e}")
+        finally:
+            job.last_check = datetime.now()
+            job.next_run = time.monotonic() + job.interval
+            job.running = False
+
+    def refresh_now(self, name):
+        """Refresh one source right away in the calling thread, even if its files did not change"""
+        with self._lock:
+            job = self._jobs[name]
+            if job.running:
+                return False
+            job.running = True
+        self._refresh(job, force=True)
+        return True
+
+    def stats(self):
+        """Last refresh time and duration of every source, for monitoring"""
+        with self._lock:
+            return {name: job.stats() for name, job in self._jobs.items()}
+
+
+# Global instance
+refresh_scheduler = RefreshScheduler()
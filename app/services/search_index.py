@@ -0,0 +1,198 @@
+# services/search_index.py
+
+import bisect
+import functools
+import math
+import re
+import unicodedata
+from collections import Counter
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Query terms shorter than this match whole tokens only; a one or two letter
+# prefix would expand to a large part of the vocabulary on every keystroke
+MIN_PREFIX_LENGTH = 3
+
+
+def fold_text(text):
+    """Lowercase and strip accents so 'Économie' and 'economie' match."""
+    if not isinstance(text, str):
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@functools.lru_cache(maxsize=65536)
+def _fold_token(token):
+    return fold_text(token)
+
+
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return [_fold_token(token) for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+class SearchIndex:
+    """Token-level inverted index over article text with BM25 ranking.
+
+    Document ids are the row ids of the news snapshot. Every query term of
+    at least MIN_PREFIX_LENGTH characters is matched as a prefix of indexed
+    tokens so results update as the user types.
+
+    The postings of a loaded index are flat arrays (see to_arrays()); the
+    documents added afterwards are kept in per-token lists next to them.
+
+    Documents are only ever appended, so one index is shared by successive
+    news snapshots: search() and rank() may see documents added after the
+    caller's snapshot, which the caller bounds by its own row count.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    # Bump when the tokenizer or the array layout changes, to invalidate saved indexes
+    FORMAT_VERSION = 1
+
+    def __init__(self):
+        self._postings = {}      # token -> ([doc ids], [term frequencies]) added since the base
+        self._frozen = {}        # token -> (added docs covered, np doc ids, np tfs), rebuilt lazily
+        self._terms = []         # sorted vocabulary for prefix lookups
+        self._doc_lengths = []
+        # Postings loaded from arrays: token -> position, offsets, doc ids and tfs
+        self._base_positions = {}
+        self._base = None
+
+    @classmethod
+    def build(cls, *columns):
+        index = cls()
+        index.add(0, *columns)
+        return index
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Index saved by to_arrays()."""
+        index = cls()
+        terms = arrays['terms'].tolist()
+        index._terms = terms
+        index._base_positions = dict(zip(terms, range(len(terms))))
+        index._base = (arrays['offsets'], arrays['doc_ids'], arrays['tfs'])
+        index._doc_lengths = arrays['doc_lengths'].tolist()
+        return index
+
+    def to_arrays(self):
+        """Postings as flat arrays, one slice per token of the sorted vocabulary, to save the index."""
+        terms = self._terms
+        postings = [self._posting_arrays(token) for token in terms]
+        offsets = np.zeros(len(terms) + 1, dtype='int64')
+        offsets[1:] = np.cumsum([len(ids) for ids, _ in postings])
+        empty = np.empty(0, dtype='int64')
+        return {
+            'terms': np.array(terms, dtype=str),
+            'offsets': offsets,
+            'doc_ids': np.concatenate([ids for ids, _ in postings]) if postings else empty,
+            'tfs': np.concatenate([tfs for _, tfs in postings]).astype('int32') if postings else empty,
+            'doc_lengths': np.asarray(self._doc_lengths, dtype='int32')
+        }
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def add(self, first_id, *columns):
+        """Index documents first_id, first_id + 1, ... built from the given text columns."""
+        if first_id != len(self._doc_lengths):
+            raise ValueError(f"Expected next document id {len(self._doc_lengths)}, got {first_id}")
+        new_terms = []
+        for doc_id, texts in enumerate(zip(*columns), start=first_id):
+            tokens = [token for text in texts for token in tokenize(text)]
+            self._doc_lengths.append(len(tokens))
+            for token, tf in Counter(tokens).items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = ([], [])
+                    if token not in self._base_positions:
+                        new_terms.append(token)
+                # Frequency first, so a reader never sees a doc id without its tf
+                postings[1].append(tf)
+                postings[0].append(doc_id)
+        if new_terms:
+            # A new list, as the vocabulary may be shared with the index this one was copied from
+            self._terms = sorted(self._terms + new_terms)
+
+    def _has_token(self, token):
+        return token in self._postings or token in self._base_positions
+
+    def _expand(self, prefix):
+        """All indexed tokens starting with prefix, or the token itself for a short prefix."""
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return [prefix] if self._has_token(prefix) else []
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + '\uffff')
+        return self._terms[start:end]
+
+    def _posting_arrays(self, token):
+        added = self._postings.get(token)
+        covered = len(added[0]) if added is not None else 0
+        frozen = self._frozen.get(token)
+        # Checked against the added docs, so an entry cached before an add is never served as current
+        if frozen is not None and frozen[0] == covered:
+            return frozen[1], frozen[2]
+        ids_parts, tfs_parts = [], []
+        position = self._base_positions.get(token)
+        if position is not None:
+            offsets, base_ids, base_tfs = self._base
+            start, end = offsets[position], offsets[position + 1]
+            ids_parts.append(base_ids[start:end])
+            tfs_parts.append(base_tfs[start:end])
+        if added is not None:
+            ids_parts.append(np.asarray(added[0][:covered], dtype='int64'))
+            tfs_parts.append(np.asarray(added[1][:covered]))
+        doc_ids = np.concatenate(ids_parts).astype('int64', copy=False)
+        tfs = np.concatenate(tfs_parts).astype('float64')
+        self._frozen[token] = (covered, doc_ids, tfs)
+        return doc_ids, tfs
+
+    def _term_matches(self, term):
+        """Sorted doc ids containing a token that starts with term."""
+        tokens = self._expand(term)
+        if not tokens:
+            return np.empty(0, dtype='int64')
+        if len(tokens) == 1:
+            return self._posting_arrays(tokens[0])[0]
+        return np.unique(np.concatenate([self._posting_arrays(token)[0] for token in tokens]))
+
+    def search(self, query):
+        """Return sorted doc ids matching every term of the query."""
+        terms = tokenize(query)
+        if not terms:
+            return np.arange(len(self), dtype='int64')
+        result = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            matches = self._term_matches(term)
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+            if result.size == 0:
+                break
+        return result
+
+    def rank(self, query, doc_ids, doc_count=None):
+        """Order doc_ids by descending BM25 score for the query, over the first doc_count documents."""
+        doc_ids = np.asarray(doc_ids, dtype='int64')
+        terms = set(tokenize(query))
+        if not terms or doc_ids.size == 0:
+            return doc_ids
+        if doc_count is None:
+            doc_count = len(self)
+        doc_lengths = np.asarray(self._doc_lengths[:doc_count], dtype='float64')
+        avg_length = doc_lengths.mean() if doc_count else 0.0
+        norms = self.K1 * (1 - self.B + self.B * doc_lengths / (avg_length or 1.0))
+        scores = np.zeros(doc_count, dtype='float64')
+        for term in terms:
+            for token in self._expand(term):
+                ids, tfs = self._posting_arrays(token)
+                covered = np.searchsorted(ids, doc_count)
+                ids, tfs = ids[:covered], tfs[:covered]
+                idf = math.log(1 + (doc_count - len(ids) + 0.5) / (len(ids) + 0.5))
+                scores[ids] += idf * tfs * (self.K1 + 1) / (tfs + norms[ids])
+        order = np.argsort(-scores[doc_ids], kind='stable')
+        return doc_ids[order]
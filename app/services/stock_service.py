@@ -1,102 +1,180 @@
 # services/stock_service.py
 
-import os
+import threading
+
 import pandas as pd
 from config.settings import Config
+from services.data_cache import read_csv_cached
+from services.article_ids import PUBLISHED_FORMAT, article_ids
+from services.favorites_store import STOCK_FAVORITE_COLUMNS, stock_favorites_store
+from services.lazy_data import warm_up_loader
 from styles.styles import COLORS
 
+def prepare_articles_data(articles_df):
+    """Data preprocessing of the raw stock articles"""
+    articles_df['published'] = pd.to_datetime(articles_df['published'])
+    return articles_df
+
 class StockService:
     def __init__(self):
         self.config = Config()
         self.articles_df = None
         self.sentiment_df = None
-        self.stock_favorites_file = '/Users/mac/Sentiment Analysis Press/app/my_stock_news.csv'
-        self.load_data()
+        self.stock_favorites_store = stock_favorites_store
+        self._article_index = (None, {})
+        self._stock_index = self._build_stock_index(pd.DataFrame(), pd.DataFrame())
+        # Incremented on every load so derived views know when to recompute
+        self._data_version = 0
+        # The CSV files are read on first use, not when the module is imported
+        self._loaded = False
+        self._load_lock = threading.Lock()
+    
+    def ensure_loaded(self):
+        """Load the CSV files if they were not loaded yet"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    try:
+                        self.load_data()
+                    except Exception as e:
+                        print(f"Error loading stock data: {e}")
+                        self._publish(pd.DataFrame(), pd.DataFrame())
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    @property
+    def data_version(self):
+        self.ensure_loaded()
+        return self._data_version
     
+    def get_data_paths(self):
+        """Paths of the CSV files the stock data is loaded from"""
+        return [self.config.config['paths']['stock_sentiment_news'], self.config.config['paths']['stock_sentiment_kpi']]
+
     def load_data(self):
-        """Load stock data from CSV files"""
-        try:
-            self.articles_df = pd.read_csv(self.config.config['paths']['stock_sentiment_news'])
-            self.sentiment_df = pd.read_csv(self.config.config['paths']['stock_sentiment_kpi'])
-            
-            # Data preprocessing
-            self.articles_df['published'] = pd.to_datetime(self.articles_df['published'])
-        except Exception as e:
-            print(f"Error loading stock data: {e}")
-            self.articles_df = pd.DataFrame()
-            self.sentiment_df = pd.DataFrame()
+        """Load stock data from CSV files; raises and keeps the current data if they cannot be read"""
+        articles_df = read_csv_cached(self.config.config['paths']['stock_sentiment_news'],
+                                      prepare=prepare_articles_data)
+        sentiment_df = read_csv_cached(self.config.config['paths']['stock_sentiment_kpi'])
+        self._publish(articles_df, sentiment_df)
+
+    def _publish(self, articles_df, sentiment_df):
+        # Everything is built before being published, so readers never see a half-loaded state
+        stock_index = self._build_stock_index(articles_df, sentiment_df)
+        self.articles_df, self.sentiment_df, self._stock_index = articles_df, sentiment_df, stock_index
+        self._data_version += 1
+        self._loaded = True
+
+    def reload_data(self):
+        """Load the CSV files again, e.g. from the refresh scheduler"""
+        with self._load_lock:
+            self.load_data()
+
+    def _build_stock_index(self, articles_df, sentiment_df):
+        """Per-stock article slices (newest first) and sentiment aggregates, for 'all' and every stock"""
+        stock_index = {'articles': {}, 'sentiment': {}, 'averages': {}, 'risk': {}}
+        if not articles_df.empty:
+            ordered = articles_df.sort_values('published', ascending=False, kind='mergesort')
+            stock_index['articles']['all'] = ordered
+            if 'stock' in ordered.columns:
+                stock_index['articles'].update((stock, rows) for stock, rows in ordered.groupby('stock', sort=False))
+        if not sentiment_df.empty:
+            slices = {'all': sentiment_df}
+            if 'stock' in sentiment_df.columns:
+                slices.update((stock, rows) for stock, rows in sentiment_df.groupby('stock', sort=False))
+            for stock, data in slices.items():
+                stock_index['sentiment'][stock] = data
+                stock_index['averages'][stock] = self._compute_sentiment_averages(data)
+                stock_index['risk'][stock] = self._compute_risk_metrics(data)
+        return stock_index
+    
+    def get_article(self, article_id):
+        """Get the fields saved with a favorite stock article, looked up by article id"""
+        self.ensure_loaded()
+        articles_df = self.articles_df
+        indexed_df, article_index = self._article_index
+        if indexed_df is not articles_df:
+            ids = article_ids(articles_df['title'], articles_df['published']) if not articles_df.empty else []
+            article_index = dict(zip(ids, range(len(ids))))
+            self._article_index = (articles_df, article_index)
+        position = article_index.get(article_id)
+        if position is None:
+            return None
+        row = articles_df.iloc[position]
+        article = {column: row.get(column) for column in STOCK_FAVORITE_COLUMNS}
+        if 'mini_resume' not in row.index:
+            article['mini_resume'] = row.get('summary', '')
+        article = {column: None if pd.isna(value) else value for column, value in article.items()}
+        article['published'] = row['published'].strftime(PUBLISHED_FORMAT)
+        return article
     
     def get_analyzed_stocks_list(self):
         """Get list of analyzed stocks"""
+        self.ensure_loaded()
         if self.sentiment_df is not None and not self.sentiment_df.empty:
             return self.sentiment_df['stock'].unique().tolist()
         return []
     
     def get_articles_data(self, stock_filter='all'):
-        """Get filtered articles data"""
+        """Get filtered articles data, newest first"""
+        self.ensure_loaded()
         if self.articles_df is None or self.articles_df.empty:
             return pd.DataFrame()
-        
-        if stock_filter == 'all':
-            return self.articles_df
-        else:
-            return self.articles_df[self.articles_df['stock'] == stock_filter]
+        data = self._stock_index['articles'].get(stock_filter)
+        return data if data is not None else self.articles_df.iloc[0:0]
     
     def get_sentiment_data(self, stock_filter='all'):
         """Get filtered sentiment data"""
+        self.ensure_loaded()
         if self.sentiment_df is None or self.sentiment_df.empty:
             return pd.DataFrame()
-        
-        if stock_filter == 'all':
-            return self.sentiment_df
-        else:
-            return self.sentiment_df[self.sentiment_df['stock'] == stock_filter]
+        data = self._stock_index['sentiment'].get(stock_filter)
+        return data if data is not None else self.sentiment_df.iloc[0:0]
     
     def load_stock_favorites(self):
-        """Load stock favorites from CSV"""
-        if os.path.exists(self.stock_favorites_file):
-            try:
-                return pd.read_csv(self.stock_favorites_file)
-            except:
-                return pd.DataFrame(columns=['stock', 'source', 'title', 'mini_resume', 'sentiment', 'published', 'link'])
-        else:
-            return pd.DataFrame(columns=['stock', 'source', 'title', 'mini_resume', 'sentiment', 'published', 'link'])
+        """Load stock favorites as a DataFrame"""
+        return self.stock_favorites_store.load()
     
     def save_to_stock_favorites(self, article_data):
         """Save article to stock favorites"""
-        favorites_df = self.load_stock_favorites()
-        
-        # Check if article already exists
-        if not ((favorites_df['title'] == article_data['title']) & 
-                (favorites_df['published'] == article_data['published'])).any():
-            # Add new favorite
-            new_row = pd.DataFrame([article_data])
-            favorites_df = pd.concat([favorites_df, new_row], ignore_index=True)
-            
-            # Ensure data directory exists
-            os.makedirs(os.path.dirname(self.stock_favorites_file), exist_ok=True)
-            favorites_df.to_csv(self.stock_favorites_file, index=False)
+        self.stock_favorites_store.add(article_data)
     
     def remove_from_stock_favorites(self, title, published):
         """Remove article from stock favorites"""
-        favorites_df = self.load_stock_favorites()
-        favorites_df = favorites_df[~((favorites_df['title'] == title) & 
-                                    (favorites_df['published'] == published))]
-        
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(self.stock_favorites_file), exist_ok=True)
-        favorites_df.to_csv(self.stock_favorites_file, index=False)
-    
+        self.stock_favorites_store.remove(title, published)
+
+    def stock_favorite_keys(self):
+        """Get the set of (title, published) keys of the favorite stock articles"""
+        return self.stock_favorites_store.keys()
+
+    def stock_favorite_article_ids(self):
+        """Get the set of article ids of the favorite stock articles"""
+        return self.stock_favorites_store.article_ids()
+
+    def toggle_stock_favorite(self, article_data):
+        """Save or remove a stock article in one write; returns whether it is now favorited"""
+        return self.stock_favorites_store.toggle(article_data)
+
     def is_stock_favorited(self, title, published):
         """Check if article is favorited"""
-        favorites_df = self.load_stock_favorites()
-        return ((favorites_df['title'] == title) & 
-                (favorites_df['published'] == published)).any()
+        return self.stock_favorites_store.contains(title, published)
+
+    def are_stock_favorited(self, keys):
+        """Check a batch of (title, published) keys against a single load of the favorites"""
+        favorite_keys = self.stock_favorite_keys()
+        return [key in favorite_keys for key in keys]
     
     def calculate_risk_metrics(self, stock_filter='all'):
-        """Calculate risk metrics for given stock filter"""
-        data = self.get_sentiment_data(stock_filter)
-        
+        """Get risk metrics for given stock filter, precomputed at load"""
+        self.ensure_loaded()
+        risk_metrics = self._stock_index['risk'].get(stock_filter)
+        return risk_metrics if risk_metrics is not None else self._compute_risk_metrics(pd.DataFrame())
+    
+    @staticmethod
+    def _compute_risk_metrics(data):
+        """Calculate risk metrics of sentiment rows"""
         if data.empty:
             return {
                 'avg_volatility': 0,
@@ -115,9 +193,14 @@ class StockService:
         }
     
     def get_sentiment_averages(self, stock_filter='all'):
-        """Get sentiment averages for given stock filter"""
-        data = self.get_sentiment_data(stock_filter)
-        
+        """Get sentiment averages for given stock filter, precomputed at load"""
+        self.ensure_loaded()
+        averages = self._stock_index['averages'].get(stock_filter)
+        return averages if averages is not None else self._compute_sentiment_averages(pd.DataFrame())
+    
+    @staticmethod
+    def _compute_sentiment_averages(data):
+        """Calculate sentiment averages of sentiment rows"""
         if data.empty:
             return {'Haussier': 0, 'Neutre': 0, 'Baissier': 0}
         
@@ -129,6 +212,7 @@ class StockService:
 
 # Global instance
 stock_service = StockService()
+warm_up_loader('stock', stock_service.ensure_loaded)
 
 # Convenience functions for backward compatibility
 def get_analyzed_stocks_list():
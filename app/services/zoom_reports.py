@@ -0,0 +1,141 @@
+# services/zoom_reports.py
+
+import threading
+from datetime import timedelta
+
+import pandas as pd
+from config.settings import Config
+from services.news_store import news_store
+from services.report_cache import report_cache, report_key
+from services.report_jobs import download_pdf, report_jobs, request_pdf
+
+config = Config()
+
+# Articles in one report
+REPORT_MAX_ARTICLES = 20
+# Days of news covered by the Éco News
+ECO_NEWS_DAYS = 7
+ECO_NEWS_THEME = 'Économie'
+
+REPORT_FILENAMES = {
+    'morning': 'morning_news_final.pdf',
+    'eco': 'eco_news_report.pdf'
+}
+
+# Report cache key of the latest edition of each report type, by (report type, data version).
+# The PDFs themselves are in the report cache under the key of their content, as the data
+# versions are counters of this process only.
+_edition_keys = {}
+_edition_keys_lock = threading.Lock()
+
+
+def _report_articles(rows):
+    resumes = rows['mini_resume'] if 'mini_resume' in rows.columns else rows.get('summary', pd.Series('', index=rows.index))
+    return [
+        {'title': title, 'mini_resume': '' if pd.isna(resume) else resume}
+        for title, resume in zip(rows['title'], resumes)
+    ]
+
+
+def morning_news_articles(snapshot):
+    """Articles of the latest publication day, newest first"""
+    if snapshot.empty:
+        return []
+    last_day = snapshot.frame['published'].iloc[-1].normalize()
+    ids = snapshot.filter(start=last_day)[:REPORT_MAX_ARTICLES]
+    return _report_articles(snapshot.rows(ids))
+
+
+def ipc_summary(ipc_df):
+    """Latest month of the IPC sheet as a report item, or None without IPC data"""
+    if ipc_df is None or ipc_df.empty:
+        return None
+    latest = ipc_df.iloc[-1]
+    parts = [
+        f"Indice général: {latest['Indice Général']:.1f}",
+        f"Alimentation: {latest['Alimentation']:.1f}",
+        f"Produits non alimentaires: {latest['Produits Non Alimentaires']:.1f}"
+    ]
+    year_ago = ipc_df[ipc_df['Mois'] <= latest['Mois'] - pd.DateOffset(years=1)]
+    if not year_ago.empty and year_ago['Indice Général'].iloc[-1]:
+        change = (latest['Indice Général'] / year_ago['Indice Général'].iloc[-1] - 1) * 100
+        parts.append(f"variation sur un an: {change:+.1f}%")
+    return {
+        'title': f"Indice des Prix à la Consommation - {latest['Mois']:%m/%Y}",
+        'mini_resume': ', '.join(parts)
+    }
+
+
+def eco_news_articles(snapshot, ipc_df):
+    """IPC summary followed by the economic news of the last days, newest first"""
+    articles = []
+    summary = ipc_summary(ipc_df)
+    if summary is not None:
+        articles.append(summary)
+    if not snapshot.empty:
+        start = snapshot.frame['published'].iloc[-1] - timedelta(days=ECO_NEWS_DAYS)
+        theme = ECO_NEWS_THEME if ECO_NEWS_THEME in snapshot.categories.get('theme', []) else None
+        ids = snapshot.filter(start=start, theme=theme)[:REPORT_MAX_ARTICLES]
+        articles.extend(_report_articles(snapshot.rows(ids)))
+    return articles
+
+
+def generate_report(job, report_type, edition, snapshot, ipc_df):
+    """Report job task: collect the articles and have them rendered, unless this content is cached"""
+    job.update(0.05, 'Collecte des articles')
+    if report_type == 'morning':
+        articles = morning_news_articles(snapshot)
+    else:
+        articles = eco_news_articles(snapshot, ipc_df)
+    if not articles:
+        raise RuntimeError("Aucun article disponible pour ce rapport")
+
+    key = report_key(articles, config.get_report_template_version())
+    if report_cache.get(key) is None:
+        result = request_pdf(job, config.get_pdf_server_url(), articles, progress=0.2)
+        report_cache.put(key, download_pdf(job, result['download_url']))
+
+    with _edition_keys_lock:
+        for cached_edition in [cached_edition for cached_edition in _edition_keys if cached_edition[0] == report_type]:
+            del _edition_keys[cached_edition]
+        _edition_keys[edition] = key
+    # Finished jobs are kept for a while; the PDF itself stays in the report cache only
+    return {'filename': REPORT_FILENAMES[report_type], 'key': key}
+
+
+def read_report(key):
+    """PDF stored in the report cache under this key, or None if it was evicted"""
+    path = report_cache.file(key)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def cached_edition(edition):
+    """PDF of an edition already generated and still in the report cache, or None"""
+    with _edition_keys_lock:
+        key = _edition_keys.get(edition)
+    if key is None or report_cache.get(key) is None:
+        return None
+    return read_report(key)
+
+
+def submit_report(report_type, ipc_df=None, ipc_version=0):
+    """Start generating a report of the current data.
+
+    Returns (job_id, None), or (None, pdf) when this edition was already
+    generated: the Morning News is versioned by the news snapshot, the Éco
+    News by the news snapshot and the IPC data.
+    """
+    snapshot = news_store.snapshot()
+    data_version = (snapshot.version,) if report_type == 'morning' else (snapshot.version, ipc_version)
+    edition = (report_type, data_version)
+    pdf = cached_edition(edition)
+    if pdf is not None:
+        return None, pdf
+    job_id = report_jobs.submit(('zoom',) + edition, generate_report, report_type, edition, snapshot, ipc_df)
+    return job_id, None
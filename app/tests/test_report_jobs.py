@@ -0,0 +1,132 @@
+# tests/test_report_jobs.py
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from services.report_jobs import ReportJobQueue, download_pdf, request_pdf
+
+PDF_CONTENT = b'%PDF-1.4 stub'
+
+
+class StubPdfServer:
+    """Local stand-in for the FastAPI PDF service, counting the render requests"""
+
+    def __init__(self):
+        self.posts = 0
+        self.running = 0
+        self.max_running = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub._lock:
+                    stub.posts += 1
+                    stub.running += 1
+                    stub.max_running = max(stub.max_running, stub.running)
+                stub.release.wait(5)
+                with stub._lock:
+                    stub.running -= 1
+                self._send(json.dumps({'filename': 'report.pdf',
+                                       'articles_count': len(payload['articles'])}).encode(), 'application/json')
+
+            def do_GET(self):
+                self._send(PDF_CONTENT, 'application/pdf')
+
+            def _send(self, body, content_type):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubPdfServer()
+    yield server
+    server.close()
+
+
+def render(job, server_url, articles):
+    result = request_pdf(job, server_url, articles, timeout=5)
+    return download_pdf(job, result['download_url'], timeout=5)
+
+
+def wait_finished(queue, job_ids, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(queue.get(job_id).finished for job_id in job_ids):
+            return [queue.get(job_id) for job_id in job_ids]
+        time.sleep(0.02)
+    raise AssertionError("report jobs did not finish")
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+
+def test_identical_submits_share_one_job(stub_server):
+    queue = ReportJobQueue(max_workers=2)
+    articles = [{'title': 'Inflation', 'mini_resume': 'Hausse des prix'}]
+
+    job_ids = {queue.submit('same-selection', render, stub_server.url, articles) for _ in range(5)}
+    wait_until(lambda: stub_server.posts)
+    stub_server.release.set()
+    [job] = wait_finished(queue, job_ids)
+
+    assert len(job_ids) == 1
+    assert stub_server.posts == 1
+    assert job.status == 'done'
+    assert job.result == PDF_CONTENT
+
+
+def test_concurrent_jobs_are_bounded_by_the_workers(stub_server):
+    queue = ReportJobQueue(max_workers=2)
+
+    job_ids = [queue.submit(f"selection-{i}", render, stub_server.url, [{'title': str(i)}]) for i in range(5)]
+    wait_until(lambda: stub_server.running == 2)
+    time.sleep(0.2)
+    assert stub_server.running == 2
+    assert sum(queue.get(job_id).status == 'queued' for job_id in job_ids) == 3
+
+    stub_server.release.set()
+    jobs = wait_finished(queue, job_ids)
+
+    assert stub_server.max_running == 2
+    assert stub_server.posts == 5
+    assert all(job.status == 'done' for job in jobs)
+    assert queue.stats() == {'done': 5}
+
+
+def test_connection_failure_sets_the_error_status():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        closed_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    queue = ReportJobQueue(max_workers=1)
+
+    [job] = wait_finished(queue, [queue.submit('unreachable', render, closed_url, [{'title': 'x'}])])
+
+    assert job.status == 'error'
+    assert job.error.startswith('Erreur de connexion au serveur')
+    assert job.result is None